@@ -1,22 +1,80 @@
+import atexit
+import base64
 import logging
-from typing import List, Optional
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
 
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError
-
+from fastapi import HTTPException, status
 
 from .config import settings
+from .models import Alert, AlertStatus, AlertSeverity, AuditLog, Resource, get_sessionmaker
+from .schemas import AlertOut
+from .crud import (
+    get_alert,
+    get_alert_async,
+    alerts_rows_stmt,
+    alerts_signature_stmt,
+)
 
 # Email and messaging platform integration
-import smtplib
 from email.mime.text import MIMEText
-import requests
+import httpx
+import orjson
+from .smtp_pool import smtp_connection
 
 logger = logging.getLogger("alerting")
 
+# Shared pool so channel sends run concurrently instead of back to back
+_delivery_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="alert-delivery")
+
+# Shared HTTP client so webhook posts reuse keep-alive TLS connections
+_http = httpx.Client(
+    timeout=5.0,
+    transport=httpx.HTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    ),
+)
+atexit.register(_http.close)
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Delivery settings bound to module globals so the hot path avoids
+# repeated BaseSettings attribute lookups. Call refresh_settings() after
+# changing `settings` at runtime (e.g. in tests).
+_FROM: str = settings.ALERT_EMAIL_FROM
+_RECIPIENTS: tuple = tuple(settings.ALERT_EMAIL_RECIPIENTS)
+_SLACK: Optional[str] = settings.SLACK_WEBHOOK_URL
+_TEAMS: Optional[str] = settings.TEAMS_WEBHOOK_URL
+
+def refresh_settings() -> None:
+    """
+    Re-read cached delivery settings from `settings`.
+    """
+    global _FROM, _RECIPIENTS, _SLACK, _TEAMS
+    _FROM = settings.ALERT_EMAIL_FROM
+    _RECIPIENTS = tuple(settings.ALERT_EMAIL_RECIPIENTS)
+    _SLACK = settings.SLACK_WEBHOOK_URL
+    _TEAMS = settings.TEAMS_WEBHOOK_URL
+
 # --- Alert Delivery ---
 
+_SUBJECT_TMPL = "[{severity_upper}] Alert for Resource {name} ({rid})"
+_BODY_TMPL = (
+    "Alert Message: {message}\n"
+    "Severity: {severity}\n"
+    "Status: {status}\n"
+    "Resource: {name} ({rid})\n"
+    "Triggered At: {ts}\n"
+)
+
 def send_email_alert(subject: str, body: str, recipients: List[str]) -> bool:
     """
     Send an alert email to designated recipients.
@@ -24,19 +82,15 @@ def send_email_alert(subject: str, body: str, recipients: List[str]) -> bool:
     try:
         msg = MIMEText(body)
         msg["Subject"] = subject
-        msg["From"] = settings.ALERT_EMAIL_FROM
+        msg["From"] = _FROM
         msg["To"] = ", ".join(recipients)
 
-        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-            if settings.SMTP_USE_TLS:
-                server.starttls()
-            if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
-                server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-            server.sendmail(settings.ALERT_EMAIL_FROM, recipients, msg.as_string())
-        logger.info(f"Alert email sent to {recipients}")
+        with smtp_connection() as conn:
+            conn.sendmail(_FROM, recipients, msg.as_string())
+        logger.info("Alert email sent to %s", recipients)
         return True
     except Exception as e:
-        logger.error(f"Failed to send alert email: {e}")
+        logger.error("Failed to send alert email: %s", e)
         return False
 
 def send_slack_alert(message: str, webhook_url: str) -> bool:
@@ -44,16 +98,16 @@ def send_slack_alert(message: str, webhook_url: str) -> bool:
     Send an alert message to Slack via webhook.
     """
     try:
-        payload = {"text": message}
-        response = requests.post(webhook_url, json=payload, timeout=5)
+        payload = orjson.dumps({"text": message})
+        response = _http.post(webhook_url, content=payload, headers=_JSON_HEADERS)
         if response.status_code == 200:
             logger.info("Alert sent to Slack.")
             return True
         else:
-            logger.error(f"Slack alert failed: {response.text}")
+            logger.error("Slack alert failed: %s", response.text)
             return False
     except Exception as e:
-        logger.error(f"Failed to send Slack alert: {e}")
+        logger.error("Failed to send Slack alert: %s", e)
         return False
 
 def send_teams_alert(message: str, webhook_url: str) -> bool:
@@ -61,16 +115,16 @@ def send_teams_alert(message: str, webhook_url: str) -> bool:
     Send an alert message to Microsoft Teams via webhook.
     """
     try:
-        payload = {"text": message}
-        response = requests.post(webhook_url, json=payload, timeout=5)
+        payload = orjson.dumps({"text": message})
+        response = _http.post(webhook_url, content=payload, headers=_JSON_HEADERS)
         if response.status_code == 200:
             logger.info("Alert sent to Teams.")
             return True
         else:
-            logger.error(f"Teams alert failed: {response.text}")
+            logger.error("Teams alert failed: %s", response.text)
             return False
     except Exception as e:
-        logger.error(f"Failed to send Teams alert: {e}")
+        logger.error("Failed to send Teams alert: %s", e)
         return False
 
 def deliver_alert(alert: Alert, resource: Resource) -> List[str]:
@@ -78,32 +132,35 @@ def deliver_alert(alert: Alert, resource: Resource) -> List[str]:
     Deliver alert via configured channels (email, Slack, Teams).
     Returns list of successful delivery channels.
     """
-    subject = f"[{alert.severity.upper()}] Alert for Resource {resource.name} ({resource.resource_id})"
-    body = f"""
-    Alert Message: {alert.message}
-    Severity: {alert.severity}
-    Status: {alert.status}
-    Resource: {resource.name} ({resource.resource_id})
-    Triggered At: {alert.triggered_at}
-    """
-    delivered_channels = []
+    if not (_RECIPIENTS or _SLACK or _TEAMS):
+        return []
+    fields = {
+        "severity": alert.severity,
+        "severity_upper": alert.severity.upper(),
+        "message": alert.message,
+        "status": alert.status,
+        "name": resource.name,
+        "rid": resource.resource_id,
+        "ts": alert.triggered_at,
+    }
+    subject = _SUBJECT_TMPL.format_map(fields)
+    body = _BODY_TMPL.format_map(fields)
+    futures = {}
 
     # Email delivery
-    if settings.ALERT_EMAIL_RECIPIENTS:
-        if send_email_alert(subject, body, settings.ALERT_EMAIL_RECIPIENTS):
-            delivered_channels.append("email")
+    if _RECIPIENTS:
+        futures["email"] = _delivery_executor.submit(send_email_alert, subject, body, list(_RECIPIENTS))
 
     # Slack delivery
-    if settings.SLACK_WEBHOOK_URL:
-        if send_slack_alert(body, settings.SLACK_WEBHOOK_URL):
-            delivered_channels.append("slack")
+    if _SLACK:
+        futures["slack"] = _delivery_executor.submit(send_slack_alert, body, _SLACK)
 
     # Teams delivery
-    if settings.TEAMS_WEBHOOK_URL:
-        if send_teams_alert(body, settings.TEAMS_WEBHOOK_URL):
-            delivered_channels.append("teams")
+    if _TEAMS:
+        futures["teams"] = _delivery_executor.submit(send_teams_alert, body, _TEAMS)
 
-    return delivered_channels
+    wait(futures.values())
+    return [channel for channel, future in futures.items() if future.result()]
 
 # --- Alert Generation ---
 
@@ -116,10 +173,12 @@ def generate_alert(
 ) -> Alert:
     """
     Generate an alert for a resource and deliver it.
+    Delivery is handed to the background worker when it is running, so
+    the caller only waits for the database insert.
     """
-    resource = db.query(Resource).filter(Resource.id == resource_id).first()
+    resource = db.get(Resource, resource_id)
     if not resource:
-        logger.error(f"Resource not found for alert generation: id={resource_id}")
+        logger.error("Resource not found for alert generation: id=%s", resource_id)
         raise ValueError("Resource not found.")
 
     alert = Alert(
@@ -127,79 +186,391 @@ def generate_alert(
         status=AlertStatus.OPEN,
         severity=severity,
         message=message,
-        triggered_at=datetime.utcnow(),
         incident_details=incident_details,
     )
     try:
+        # Flush to obtain alert.id; alert and audit entry commit together
         db.add(alert)
-        db.commit()
-        db.refresh(alert)
-        delivered_channels = deliver_alert(alert, resource)
-        alert.delivered_via = ",".join(delivered_channels)
-        db.commit()
-        logger.info(f"Alert generated and delivered via: {alert.delivered_via}")
+        db.flush()
 
         # Log audit event
         audit_log = AuditLog(
             alert_id=alert.id,
             event_type="generated",
             event_details=incident_details,
-            created_at=datetime.utcnow(),
             actor="system",
         )
         db.add(audit_log)
         db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error("Database error generating alert: %s", e)
+        raise
+
+    if enqueue_alert_delivery(alert.id):
+        logger.info("Alert generated and queued for delivery: id=%s", alert.id)
+        return alert
+
+    # No delivery worker (or queue full): deliver on the caller's thread,
+    # without a transaction open across the network calls
+    try:
+        row = db.execute(delivery_rows_stmt([alert.id])).one()
+        db.commit()
+        delivered_via = ",".join(deliver_alert(row, row))
+        _record_deliveries(db, {row.id: delivered_via})
+        db.commit()
+        logger.info("Alert generated and delivered via: %s", delivered_via)
         return alert
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error generating alert: {e}")
+        logger.error("Database error recording alert delivery: %s", e)
         raise
 
+# --- Background Delivery ---
+
+_delivery_queue: "queue.Queue[int]" = queue.Queue(maxsize=settings.ALERT_DELIVERY_QUEUE_SIZE)
+_delivery_stop = threading.Event()
+_delivery_worker: Optional[threading.Thread] = None
+
+def enqueue_alert_delivery(alert_id: int) -> bool:
+    """
+    Queue an alert for delivery by the background worker.
+    Returns False if the worker is not running or the queue stays full,
+    in which case the caller should deliver the alert itself.
+    """
+    if not (_delivery_worker and _delivery_worker.is_alive()):
+        return False
+    try:
+        _delivery_queue.put(alert_id, timeout=1)
+        return True
+    except queue.Full:
+        logger.warning("Alert delivery queue full; delivering inline: id=%s", alert_id)
+        return False
+
+def delivery_rows_stmt(alert_ids: List[int]) -> Select:
+    """
+    Build the SELECT for what deliver_alert() reads of each alert and its
+    resource. One row carries both, so it stands in for either argument.
+    """
+    return (
+        select(
+            Alert.id,
+            Alert.severity,
+            Alert.message,
+            Alert.status,
+            Alert.triggered_at,
+            Resource.name,
+            Resource.resource_id,
+        )
+        .join(Resource, Alert.resource_id == Resource.id)
+        .where(Alert.id.in_(alert_ids))
+    )
+
+def _record_deliveries(db: Session, delivered: Dict[int, str]) -> None:
+    # Core executemany, so the row_version onupdate still applies
+    alerts = Alert.__table__
+    stmt = (
+        update(alerts)
+        .where(alerts.c.id == bindparam("b_id"))
+        .values(delivered_via=bindparam("b_via"))
+    )
+    db.connection().execute(stmt, [{"b_id": alert_id, "b_via": via} for alert_id, via in delivered.items()])
+
+def deliver_pending_alerts(alert_ids: List[int], session_factory: Callable[[], Session]) -> int:
+    """
+    Deliver a batch of stored alerts and record their delivery channels.
+    The batch is read and the result written in two short transactions,
+    so no connection is held while channels are contacted.
+    Returns the number of alerts delivered.
+    """
+    try:
+        with session_factory() as db:
+            rows = db.execute(delivery_rows_stmt(alert_ids)).all()
+    except SQLAlchemyError as e:
+        logger.error("Database error loading queued alerts: %s", e)
+        return 0
+    delivered = {row.id: ",".join(deliver_alert(row, row)) for row in rows}
+    if not delivered:
+        return 0
+    with session_factory() as db:
+        try:
+            _record_deliveries(db, delivered)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error("Database error recording queued alert deliveries: %s", e)
+            return 0
+    logger.info("Delivered %s queued alerts.", len(delivered))
+    return len(delivered)
+
+def _drain_delivery_batch(first: int) -> List[int]:
+    batch = [first]
+    while len(batch) < settings.ALERT_DELIVERY_BATCH_SIZE:
+        try:
+            batch.append(_delivery_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+def _delivery_loop(session_factory: Callable[[], Session]) -> None:
+    while not _delivery_stop.is_set():
+        try:
+            first = _delivery_queue.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        deliver_pending_alerts(_drain_delivery_batch(first), session_factory)
+    # Deliver whatever is left on shutdown
+    while True:
+        try:
+            first = _delivery_queue.get_nowait()
+        except queue.Empty:
+            break
+        deliver_pending_alerts(_drain_delivery_batch(first), session_factory)
+
+def start_alert_delivery(session_factory: Optional[Callable[[], Session]] = None) -> None:
+    """
+    Start the background thread that delivers queued alerts, opening its
+    sessions from `session_factory` (the shared sessionmaker by default).
+    """
+    global _delivery_worker
+    if _delivery_worker and _delivery_worker.is_alive():
+        return
+    _delivery_stop.clear()
+    _delivery_worker = threading.Thread(
+        target=_delivery_loop,
+        args=(session_factory or get_sessionmaker(),),
+        name="alert-delivery-worker",
+        daemon=True,
+    )
+    _delivery_worker.start()
+    logger.info("Alert delivery worker started.")
+
+def stop_alert_delivery() -> None:
+    """
+    Stop the background delivery worker after draining the queue.
+    """
+    global _delivery_worker
+    if not _delivery_worker:
+        return
+    _delivery_stop.set()
+    _delivery_worker.join()
+    _delivery_worker = None
+    logger.info("Alert delivery worker stopped.")
+
 # --- Alert Query/Resolution ---
 
-def get_alerts(db: Session, status: Optional[str] = None, severity: Optional[str] = None) -> List[AlertOut]:
+def get_alerts(
+    db: Session,
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> List[AlertOut]:
     """
-    Retrieve alerts, optionally filtered by status and severity.
+    Retrieve a page of alerts, optionally filtered by status and severity.
+    `cursor` is the value returned by encode_alert_cursor() for the last
+    alert of the previous page.
     """
-    alerts = crud_get_alerts(db, status=status, severity=severity)
-    return [AlertOut.from_orm(a) for a in alerts]
+    stmt = alerts_rows_stmt(
+        status=status,
+        severity=severity,
+        skip=skip,
+        limit=limit,
+        cursor=decode_alert_cursor(cursor) if cursor else None,
+    )
+    # Validation coerces the stored enum values back to their Enum members
+    return [AlertOut.model_validate(dict(row)) for row in db.execute(stmt).mappings()]
+
+async def get_alerts_signature_async(
+    db: AsyncSession,
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+) -> tuple:
+    """
+    Return a tuple that changes whenever the filtered alert list changes,
+    for use as an HTTP validator.
+    """
+    return tuple((await db.execute(alerts_signature_stmt(status=status, severity=severity))).one())
+
+def alerts_page_stmt(
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Build the Core SELECT for a page of alerts, decoding an API `cursor`.
+    """
+    return alerts_rows_stmt(
+        status=status,
+        severity=severity,
+        skip=skip,
+        limit=limit,
+        cursor=decode_alert_cursor(cursor) if cursor else None,
+    )
+
+async def get_alerts_next_cursor_async(
+    db: AsyncSession,
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Return the cursor for the page after the given one, or None if that
+    page is not full. Only the boundary row's key columns are read.
+    """
+    stmt = alerts_page_stmt(
+        status=status, severity=severity, skip=skip + limit - 1, limit=1, cursor=cursor
+    ).with_only_columns(Alert.triggered_at, Alert.id)
+    row = (await db.execute(stmt)).first()
+    return encode_alert_cursor(row) if row else None
+
+def encode_alert_cursor(alert: AlertOut) -> str:
+    """
+    Build an opaque keyset cursor pointing just past the given alert
+    (or any row with `triggered_at` and `id`).
+    """
+    # Base64 keeps the "+" of the UTC offset from being read as a space
+    # when the cursor is passed back unencoded in a query string
+    raw = f"{alert.triggered_at.isoformat()},{alert.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_alert_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Parse a cursor produced by encode_alert_cursor().
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        triggered_at, alert_id = raw.rsplit(",", 1)
+        return datetime.fromisoformat(triggered_at), int(alert_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid alert cursor."
+        )
 
 def get_alert_by_id(db: Session, alert_id: int) -> AlertOut:
     """
     Retrieve a specific alert by ID.
     """
     alert = get_alert(db, alert_id)
-    return AlertOut.from_orm(alert)
+    return AlertOut.model_validate(alert)
+
+async def get_alert_by_id_async(db: AsyncSession, alert_id: int) -> AlertOut:
+    """
+    Async variant of get_alert_by_id().
+    """
+    alert = await get_alert_async(db, alert_id)
+    return AlertOut.model_validate(alert)
 
 def resolve_alert(db: Session, alert_id: int) -> AlertOut:
     """
     Resolve an alert and log the resolution.
+    Uses a conditional UPDATE ... RETURNING where the dialect supports it, so
+    concurrent resolvers cannot both record a resolution.
+    """
+    if not db.get_bind().dialect.update_returning:
+        return _resolve_alert_fallback(db, alert_id)
+    try:
+        stmt = (
+            update(Alert)
+            .where(Alert.id == alert_id, Alert.status != AlertStatus.RESOLVED)
+            .values(status=AlertStatus.RESOLVED, resolved_at=func.now())
+            .returning(Alert)
+        )
+        alert = db.execute(stmt).scalar_one_or_none()
+        if alert is None:
+            # Already resolved, or missing (get_alert raises 404)
+            alert = get_alert(db, alert_id)
+            logger.info("Alert already resolved: id=%s", alert_id)
+            return AlertOut.model_validate(alert)
+        resolved = AlertOut.model_validate(alert)
+
+        # Log audit event in the same transaction as the status change
+        audit_log = AuditLog(
+            alert_id=alert.id,
+            event_type="resolved",
+            event_details={"message": alert.message},
+            actor="system",
+        )
+        db.add(audit_log)
+        db.commit()
+        logger.info("Alert resolved: id=%s", alert_id)
+        return resolved
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error("Database error resolving alert: %s", e)
+        raise
+
+def _resolve_alert_fallback(db: Session, alert_id: int) -> AlertOut:
+    """
+    Resolve an alert with a SELECT followed by an UPDATE, for dialects
+    without UPDATE ... RETURNING.
     """
     alert = get_alert(db, alert_id)
     if alert.status == AlertStatus.RESOLVED:
-        logger.info(f"Alert already resolved: id={alert_id}")
-        return AlertOut.from_orm(alert)
+        logger.info("Alert already resolved: id=%s", alert_id)
+        return AlertOut.model_validate(alert)
     alert.status = AlertStatus.RESOLVED
-    alert.resolved_at = datetime.utcnow()
+    alert.resolved_at = func.now()
     try:
-        db.commit()
-        db.refresh(alert)
-        logger.info(f"Alert resolved: id={alert_id}")
-
-        # Log audit event
+        # Log audit event in the same transaction as the status change
         audit_log = AuditLog(
             alert_id=alert.id,
             event_type="resolved",
             event_details={"message": alert.message},
-            created_at=datetime.utcnow(),
             actor="system",
         )
         db.add(audit_log)
         db.commit()
-        return AlertOut.from_orm(alert)
+        logger.info("Alert resolved: id=%s", alert_id)
+        return AlertOut.model_validate(alert)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error("Database error resolving alert: %s", e)
+        raise
+
+def resolve_alerts_bulk(db: Session, alert_ids: List[int]) -> List[int]:
+    """
+    Resolve many alerts with one UPDATE and one batched audit-log insert.
+    Alerts that are already resolved or do not exist are skipped.
+    Returns the IDs of the alerts resolved by this call.
+    """
+    if not alert_ids:
+        return []
+    pending = (Alert.id.in_(alert_ids), Alert.status != AlertStatus.RESOLVED)
+    values = {"status": AlertStatus.RESOLVED, "resolved_at": func.now()}
+    try:
+        if db.get_bind().dialect.update_returning:
+            rows = db.execute(
+                update(Alert).where(*pending).values(**values).returning(Alert.id, Alert.message)
+            ).all()
+        else:
+            rows = db.execute(select(Alert.id, Alert.message).where(*pending).with_for_update()).all()
+            if rows:
+                db.execute(update(Alert).where(Alert.id.in_([row.id for row in rows])).values(**values))
+        db.bulk_insert_mappings(
+            AuditLog,
+            [
+                {
+                    "alert_id": row.id,
+                    "event_type": "resolved",
+                    "event_details": {"message": row.message},
+                    "actor": "system",
+                }
+                for row in rows
+            ],
+        )
+        db.commit()
+        logger.info("Alerts resolved in bulk: %s of %s requested", len(rows), len(alert_ids))
+        return [row.id for row in rows]
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error resolving alert: {e}")
+        logger.error("Database error resolving alerts: %s", e)
         raise
 
 # --- Security Event Alerting ---
@@ -226,6 +597,19 @@ __all__ = [
     "generate_alert",
     "generate_security_alert",
     "get_alerts",
+    "get_alerts_signature_async",
+    "alerts_page_stmt",
+    "get_alerts_next_cursor_async",
+    "encode_alert_cursor",
+    "decode_alert_cursor",
     "get_alert_by_id",
+    "get_alert_by_id_async",
     "resolve_alert",
+    "resolve_alerts_bulk",
+    "refresh_settings",
+    "enqueue_alert_delivery",
+    "delivery_rows_stmt",
+    "deliver_pending_alerts",
+    "start_alert_delivery",
+    "stop_alert_delivery",
 ]
\ No newline at end of file
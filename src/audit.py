@@ -1,9 +1,13 @@
 import logging
-from typing import List, Optional
+from typing import List
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 
+from .crud import MAX_PAGE_SIZE
 from .models import AuditLog
 from .schemas import AuditLogCreate, AuditLogOut
 
@@ -14,43 +18,92 @@ def create_audit_log(db: Session, audit_in: AuditLogCreate) -> AuditLog:
     Create a new immutable audit log entry.
     """
     try:
-        audit_log = AuditLog(**audit_in.dict())
+        audit_log = AuditLog(**audit_in.model_dump())
         db.add(audit_log)
         db.commit()
         db.refresh(audit_log)
-        logger.info(f"Audit log created: id={audit_log.id} for alert_id={audit_log.alert_id}")
+        logger.info("Audit log created: id=%s for alert_id=%s", audit_log.id, audit_log.alert_id)
         return audit_log
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error creating audit log: {e}")
+        logger.error("Database error creating audit log: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create audit log."
         )
 
+def create_audit_logs_bulk(db: Session, audits: List[AuditLogCreate]) -> int:
+    """
+    Create a batch of immutable audit log entries in a single transaction.
+    Returns the number of entries written.
+    """
+    if not audits:
+        return 0
+    try:
+        db.bulk_insert_mappings(AuditLog, [a.model_dump() for a in audits])
+        db.commit()
+        logger.info("Audit logs created: %s entries", len(audits))
+        return len(audits)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error("Database error creating audit logs: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create audit logs."
+        )
+
 def get_audit_log(db: Session, audit_log_id: int) -> AuditLogOut:
     """
     Retrieve an audit log entry by ID.
     """
-    audit_log = db.query(AuditLog).filter(AuditLog.id == audit_log_id).first()
+    audit_log = db.get(AuditLog, audit_log_id)
     if not audit_log:
-        logger.warning(f"Audit log not found: id={audit_log_id}")
+        logger.warning("Audit log not found: id=%s", audit_log_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audit log not found."
         )
-    return AuditLogOut.from_orm(audit_log)
+    return AuditLogOut.model_validate(audit_log)
+
+def audit_logs_stmt(skip: int = 0, limit: int = 100) -> Select:
+    """
+    Build the Core SELECT for a page of audit logs, newest first.
+    """
+    return (
+        select(
+            AuditLog.id,
+            AuditLog.alert_id,
+            AuditLog.event_type,
+            AuditLog.event_details,
+            AuditLog.actor,
+            AuditLog.created_at,
+        )
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .offset(skip)
+        .limit(min(limit, MAX_PAGE_SIZE))
+    )
 
 def get_audit_logs(db: Session, skip: int = 0, limit: int = 100) -> List[AuditLogOut]:
     """
     Retrieve a list of audit logs, ordered by creation time descending.
     """
-    logs = db.query(AuditLog).order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
-    return [AuditLogOut.from_orm(log) for log in logs]
+    rows = db.execute(audit_logs_stmt(skip, limit)).mappings()
+    return [AuditLogOut.model_validate(dict(row)) for row in rows]
+
+async def get_audit_logs_signature_async(db: AsyncSession) -> tuple:
+    """
+    Return a tuple that changes whenever a new audit log is written,
+    for use as an HTTP validator.
+    """
+    stmt = select(func.count(AuditLog.id), func.max(AuditLog.created_at))
+    return tuple((await db.execute(stmt)).one())
 
 # --- Exports ---
 __all__ = [
     "create_audit_log",
+    "create_audit_logs_bulk",
     "get_audit_log",
     "get_audit_logs",
-]
\ No newline at end of file
+    "audit_logs_stmt",
+    "get_audit_logs_signature_async",
+]
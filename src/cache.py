@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import List, Optional
+
+from cachetools import TTLCache
+
+from .config import settings
+
+# Process-local caches shared by the CRUD layer and the monitoring
+# integrations. Kept in their own module so writers can invalidate
+# entries without importing the integrations that read them.
+
+# Resource -> provider mappings only change on onboarding or resource updates
+PROVIDER_CACHE_TTL_SECONDS = 600
+
+# --- Resource Provider Cache ---
+# Lets the single-resource metrics path skip its database lookup entirely.
+
+_provider_cache: TTLCache = TTLCache(maxsize=10_000, ttl=PROVIDER_CACHE_TTL_SECONDS)
+_provider_cache_lock = threading.Lock()
+
+def provider_cache_get(resource_id: str):
+    with _provider_cache_lock:
+        return _provider_cache.get(resource_id)
+
+def provider_cache_put(resource) -> None:
+    with _provider_cache_lock:
+        _provider_cache[resource.resource_id] = resource
+
+def refresh_provider_cache(resource_id: Optional[str] = None) -> None:
+    """
+    Evict the cached provider for one resource, or for all resources.
+    """
+    with _provider_cache_lock:
+        if resource_id is None:
+            _provider_cache.clear()
+        else:
+            _provider_cache.pop(resource_id, None)
+
+# --- Metrics Cache ---
+# Backends report one datapoint per metrics period, so repeated scrapes
+# within a short window would fetch identical series. Entries hold the
+# backend's raw datapoints, keyed by (provider, resource_id, time bucket).
+
+_metrics_cache: TTLCache = TTLCache(maxsize=10_000, ttl=settings.METRICS_CACHE_TTL)
+_metrics_cache_lock = threading.Lock()
+
+def _metrics_cache_key(resource) -> tuple:
+    bucket = int(time.time()) // max(settings.METRICS_CACHE_TTL, 1)
+    return resource.cloud_provider.lower(), resource.resource_id, bucket
+
+def metrics_cache_get(resource) -> Optional[list]:
+    if not settings.METRICS_CACHE_ENABLED:
+        return None
+    with _metrics_cache_lock:
+        cached = _metrics_cache.get(_metrics_cache_key(resource))
+    return list(cached) if cached is not None else None
+
+def metrics_cache_put(resource, metrics: List) -> None:
+    # Empty results may come from a failed backend call, so they are not cached
+    if not settings.METRICS_CACHE_ENABLED or not metrics:
+        return
+    with _metrics_cache_lock:
+        _metrics_cache[_metrics_cache_key(resource)] = tuple(metrics)
+
+# --- Exports ---
+__all__ = [
+    "PROVIDER_CACHE_TTL_SECONDS",
+    "provider_cache_get",
+    "provider_cache_put",
+    "refresh_provider_cache",
+    "metrics_cache_get",
+    "metrics_cache_put",
+]
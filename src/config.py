@@ -1,58 +1,74 @@
 import os
-from typing import List, Optional
-from pydantic import BaseSettings, Field, AnyUrl, validator
+from typing import Annotated, List, Optional
+from pydantic import AnyUrl, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 class Settings(BaseSettings):
     """
     Application configuration loaded from environment variables.
     """
     # --- API ---
-    API_HOST: str = Field(default="0.0.0.0", env="API_HOST")
-    API_PORT: int = Field(default=8000, env="API_PORT")
-    DEBUG: bool = Field(default=False, env="DEBUG")
-    ALLOWED_ORIGINS: List[str] = Field(default=["*"], env="ALLOWED_ORIGINS")
+    API_HOST: str = "0.0.0.0"
+    API_PORT: int = 8000
+    DEBUG: bool = False
+    ALLOWED_ORIGINS: Annotated[List[str], NoDecode] = ["*"]
 
     # --- Database ---
-    DATABASE_URL: str = Field(..., env="DATABASE_URL")
+    DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800
+    ENTITY_CACHE_TTL: int = 60
 
     # --- Monitoring Integrations ---
-    AWS_ACCESS_KEY_ID: Optional[str] = Field(default=None, env="AWS_ACCESS_KEY_ID")
-    AWS_SECRET_ACCESS_KEY: Optional[str] = Field(default=None, env="AWS_SECRET_ACCESS_KEY")
-    AWS_REGION: Optional[str] = Field(default="us-east-1", env="AWS_REGION")
-    PROMETHEUS_URL: Optional[AnyUrl] = Field(default=None, env="PROMETHEUS_URL")
+    AWS_ACCESS_KEY_ID: Optional[str] = None
+    AWS_SECRET_ACCESS_KEY: Optional[str] = None
+    AWS_REGION: Optional[str] = "us-east-1"
+    PROMETHEUS_URL: Optional[AnyUrl] = None
+    MONITORING_CONCURRENCY: int = 32
+    METRICS_CACHE_ENABLED: bool = True
+    METRICS_CACHE_TTL: int = 60
 
     # --- Resource Discovery ---
-    ENABLE_AWS_DISCOVERY: bool = Field(default=True, env="ENABLE_AWS_DISCOVERY")
-    ENABLE_PROMETHEUS_DISCOVERY: bool = Field(default=True, env="ENABLE_PROMETHEUS_DISCOVERY")
+    ENABLE_AWS_DISCOVERY: bool = True
+    ENABLE_PROMETHEUS_DISCOVERY: bool = True
 
     # --- Alerting (Email) ---
-    ALERT_EMAIL_FROM: str = Field(default="alerts@example.com", env="ALERT_EMAIL_FROM")
-    ALERT_EMAIL_RECIPIENTS: List[str] = Field(default=[], env="ALERT_EMAIL_RECIPIENTS")
-    SMTP_SERVER: str = Field(default="smtp.example.com", env="SMTP_SERVER")
-    SMTP_PORT: int = Field(default=587, env="SMTP_PORT")
-    SMTP_USE_TLS: bool = Field(default=True, env="SMTP_USE_TLS")
-    SMTP_USERNAME: Optional[str] = Field(default=None, env="SMTP_USERNAME")
-    SMTP_PASSWORD: Optional[str] = Field(default=None, env="SMTP_PASSWORD")
+    ALERT_EMAIL_FROM: str = "alerts@example.com"
+    ALERT_EMAIL_RECIPIENTS: Annotated[List[str], NoDecode] = []
+    SMTP_SERVER: str = "smtp.example.com"
+    SMTP_PORT: int = 587
+    SMTP_USE_TLS: bool = True
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_POOL_SIZE: int = 4
 
     # --- Alerting (Messaging) ---
-    SLACK_WEBHOOK_URL: Optional[str] = Field(default=None, env="SLACK_WEBHOOK_URL")
-    TEAMS_WEBHOOK_URL: Optional[str] = Field(default=None, env="TEAMS_WEBHOOK_URL")
+    SLACK_WEBHOOK_URL: Optional[str] = None
+    TEAMS_WEBHOOK_URL: Optional[str] = None
+
+    # --- Alerting (Delivery Worker) ---
+    ALERT_DELIVERY_QUEUE_SIZE: int = 10000
+    ALERT_DELIVERY_BATCH_SIZE: int = 50
 
     # --- Security ---
-    SECRET_KEY: str = Field(default="supersecretkey", env="SECRET_KEY")
+    SECRET_KEY: str = "supersecretkey"
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+    )
 
-    @validator("ALLOWED_ORIGINS", pre=True)
+    @field_validator("ALLOWED_ORIGINS", mode="before")
+    @classmethod
     def parse_allowed_origins(cls, v):
         if isinstance(v, str):
             return [origin.strip() for origin in v.split(",") if origin.strip()]
         return v
 
-    @validator("ALERT_EMAIL_RECIPIENTS", pre=True)
+    @field_validator("ALERT_EMAIL_RECIPIENTS", mode="before")
+    @classmethod
     def parse_email_recipients(cls, v):
         if isinstance(v, str):
             return [email.strip() for email in v.split(",") if email.strip()]
@@ -1,10 +1,19 @@
 import logging
-from typing import List, Optional, Any
-from sqlalchemy.orm import Session
+import threading
+from datetime import datetime
+from typing import List, Optional, Any, Set, Tuple
+from cachetools import TTLCache
+from sqlalchemy import func, insert, inspect, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from fastapi import HTTPException, status
 
+from .config import settings
 from .models import Product, Resource, Alert, AuditLog, AlertStatus
+from .cache import refresh_provider_cache
 from .schemas import (
     ProductCreate,
     ProductUpdate,
@@ -17,6 +26,53 @@ from .schemas import (
 
 logger = logging.getLogger("crud")
 
+def _insert_many(db: Session, model, rows: List[dict]) -> List[int]:
+    """
+    Insert rows with a single executemany and return their new primary keys,
+    in the same order as `rows`. Uses INSERT ... RETURNING where the dialect
+    supports it for executemany, otherwise falls back to bulk_insert_mappings.
+    """
+    if db.get_bind().dialect.insert_executemany_returning:
+        # Batched RETURNING rows are not guaranteed to follow parameter order
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(db.execute(stmt, rows).scalars())
+    db.bulk_insert_mappings(model, rows, return_defaults=True)
+    return [row["id"] for row in rows]
+
+# --- Read-Through Entity Cache ---
+# Products and resources change rarely but are read on every alert path.
+# Column values (not ORM instances) are cached per process and re-attached
+# to the caller's session with merge(load=False), which issues no SQL.
+# Writers evict both before and after committing: the first pass covers a
+# failed commit, the second drops anything a concurrent reader cached from
+# the pre-commit row while the commit was in flight.
+
+_product_cache: TTLCache = TTLCache(maxsize=10_000, ttl=settings.ENTITY_CACHE_TTL)
+_resource_cache: TTLCache = TTLCache(maxsize=10_000, ttl=settings.ENTITY_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+def _cache_lookup(db: Session, cache: TTLCache, key: Any, model):
+    with _cache_lock:
+        values = cache.get(key)
+    if values is None:
+        return None
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return db.merge(instance, load=False)
+
+def _cache_store(cache: TTLCache, key: Any, instance) -> None:
+    values = {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
+    with _cache_lock:
+        cache[key] = values
+
+def _cache_evict(cache: TTLCache, key: Any) -> None:
+    with _cache_lock:
+        cache.pop(key, None)
+
+def _evict_resource(cloud_resource_id: str) -> None:
+    _cache_evict(_resource_cache, cloud_resource_id)
+    refresh_provider_cache(cloud_resource_id)
+
 # --- Product CRUD Operations ---
 
 def create_product(db: Session, product_in: ProductCreate) -> Product:
@@ -24,22 +80,22 @@ def create_product(db: Session, product_in: ProductCreate) -> Product:
     Create a new product.
     """
     try:
-        product = Product(**product_in.dict())
+        product = Product(**product_in.model_dump())
         db.add(product)
         db.commit()
         db.refresh(product)
-        logger.info(f"Product created: {product.name} (id={product.id})")
+        logger.info("Product created: %s (id=%s)", product.name, product.id)
         return product
     except IntegrityError as e:
         db.rollback()
-        logger.error(f"Integrity error creating product: {e}")
+        logger.error("Integrity error creating product: %s", e)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Product with this name already exists."
         )
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error creating product: {e}")
+        logger.error("Database error creating product: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create product."
@@ -49,13 +105,17 @@ def get_product(db: Session, product_id: int) -> Product:
     """
     Retrieve a product by ID.
     """
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = _cache_lookup(db, _product_cache, product_id, Product)
+    if product is not None:
+        return product
+    product = db.get(Product, product_id)
     if not product:
-        logger.warning(f"Product not found: id={product_id}")
+        logger.warning("Product not found: id=%s", product_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found."
         )
+    _cache_store(_product_cache, product_id, product)
     return product
 
 def get_products(db: Session, skip: int = 0, limit: int = 100) -> List[Product]:
@@ -69,23 +129,25 @@ def update_product(db: Session, product_id: int, product_in: ProductUpdate) -> P
     Update an existing product.
     """
     product = get_product(db, product_id)
-    for field, value in product_in.dict(exclude_unset=True).items():
+    for field, value in product_in.model_dump(exclude_unset=True).items():
         setattr(product, field, value)
     try:
+        _cache_evict(_product_cache, product_id)
         db.commit()
+        _cache_evict(_product_cache, product_id)
         db.refresh(product)
-        logger.info(f"Product updated: id={product_id}")
+        logger.info("Product updated: id=%s", product_id)
         return product
     except IntegrityError as e:
         db.rollback()
-        logger.error(f"Integrity error updating product: {e}")
+        logger.error("Integrity error updating product: %s", e)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Product with this name already exists."
         )
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error updating product: {e}")
+        logger.error("Database error updating product: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update product."
@@ -97,12 +159,14 @@ def delete_product(db: Session, product_id: int) -> None:
     """
     product = get_product(db, product_id)
     try:
+        _cache_evict(_product_cache, product_id)
         db.delete(product)
         db.commit()
-        logger.info(f"Product deleted: id={product_id}")
+        _cache_evict(_product_cache, product_id)
+        logger.info("Product deleted: id=%s", product_id)
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error deleting product: {e}")
+        logger.error("Database error deleting product: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete product."
@@ -115,34 +179,84 @@ def create_resource(db: Session, resource_in: ResourceCreate) -> Resource:
     Create a new resource.
     """
     try:
-        resource = Resource(**resource_in.dict())
+        resource = Resource(**resource_in.model_dump())
         db.add(resource)
         db.commit()
         db.refresh(resource)
-        logger.info(f"Resource created: {resource.resource_id} (id={resource.id})")
+        logger.info("Resource created: %s (id=%s)", resource.resource_id, resource.id)
         return resource
     except IntegrityError as e:
         db.rollback()
-        logger.error(f"Integrity error creating resource: {e}")
+        logger.error("Integrity error creating resource: %s", e)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Resource with this ID already exists."
         )
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error creating resource: {e}")
+        logger.error("Database error creating resource: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create resource."
         )
 
+# Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def create_resources_if_absent(db: Session, resources_in: List[ResourceCreate]) -> List[str]:
+    """
+    Create the given resources, skipping any whose resource_id already exists.
+    Returns the resource_ids that were actually inserted.
+    """
+    if not resources_in:
+        return []
+    rows = [r.model_dump() for r in resources_in]
+    dialect = db.get_bind().dialect
+    dialect_insert = _UPSERT_INSERTS.get(dialect.name)
+    try:
+        if dialect_insert is not None and dialect.insert_executemany_returning:
+            # One statement per batch: no existence pre-check and no race
+            # window between checking and inserting
+            stmt = (
+                dialect_insert(Resource)
+                .on_conflict_do_nothing(index_elements=[Resource.resource_id])
+                .returning(Resource.resource_id)
+            )
+            inserted = list(db.execute(stmt, rows).scalars())
+        else:
+            existing = get_existing_resource_ids(db, [row["resource_id"] for row in rows])
+            rows = [row for row in rows if row["resource_id"] not in existing]
+            if rows:
+                _insert_many(db, Resource, rows)
+            inserted = [row["resource_id"] for row in rows]
+        db.commit()
+        logger.info("Resources created: %s entries", len(inserted))
+        return inserted
+    except IntegrityError as e:
+        db.rollback()
+        logger.error("Integrity error creating resources: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resource with this ID already exists."
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error("Database error creating resources: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create resources."
+        )
+
 def get_resource(db: Session, resource_id: int) -> Resource:
     """
     Retrieve a resource by DB ID.
     """
-    resource = db.query(Resource).filter(Resource.id == resource_id).first()
+    resource = db.get(Resource, resource_id)
     if not resource:
-        logger.warning(f"Resource not found: id={resource_id}")
+        logger.warning("Resource not found: id=%s", resource_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found."
@@ -153,7 +267,28 @@ def get_resource_by_resource_id(db: Session, resource_id: str) -> Optional[Resou
     """
     Retrieve a resource by its cloud resource_id.
     """
-    return db.query(Resource).filter(Resource.resource_id == resource_id).first()
+    resource = _cache_lookup(db, _resource_cache, resource_id, Resource)
+    if resource is not None:
+        return resource
+    resource = db.query(Resource).filter(Resource.resource_id == resource_id).first()
+    if resource:
+        _cache_store(_resource_cache, resource_id, resource)
+    return resource
+
+# Bound on IN-list size, keeping each lookup well under driver parameter limits
+IN_CLAUSE_CHUNK_SIZE = 500
+
+def get_existing_resource_ids(db: Session, resource_ids: List[str]) -> Set[str]:
+    """
+    Return the subset of the given cloud resource_ids that already exist.
+    """
+    existing: Set[str] = set()
+    for offset in range(0, len(resource_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = resource_ids[offset:offset + IN_CLAUSE_CHUNK_SIZE]
+        existing.update(
+            db.execute(select(Resource.resource_id).where(Resource.resource_id.in_(chunk))).scalars()
+        )
+    return existing
 
 def get_resources(db: Session, skip: int = 0, limit: int = 100) -> List[Resource]:
     """
@@ -166,23 +301,25 @@ def update_resource(db: Session, resource_id: int, resource_in: ResourceUpdate)
     Update an existing resource.
     """
     resource = get_resource(db, resource_id)
-    for field, value in resource_in.dict(exclude_unset=True).items():
+    for field, value in resource_in.model_dump(exclude_unset=True).items():
         setattr(resource, field, value)
     try:
+        _evict_resource(resource.resource_id)
         db.commit()
+        _evict_resource(resource.resource_id)
         db.refresh(resource)
-        logger.info(f"Resource updated: id={resource_id}")
+        logger.info("Resource updated: id=%s", resource_id)
         return resource
     except IntegrityError as e:
         db.rollback()
-        logger.error(f"Integrity error updating resource: {e}")
+        logger.error("Integrity error updating resource: %s", e)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Resource with this ID already exists."
         )
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error updating resource: {e}")
+        logger.error("Database error updating resource: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update resource."
@@ -193,13 +330,16 @@ def delete_resource(db: Session, resource_id: int) -> None:
     Delete a resource by ID.
     """
     resource = get_resource(db, resource_id)
+    cloud_resource_id = resource.resource_id
     try:
+        _evict_resource(cloud_resource_id)
         db.delete(resource)
         db.commit()
-        logger.info(f"Resource deleted: id={resource_id}")
+        _evict_resource(cloud_resource_id)
+        logger.info("Resource deleted: id=%s", resource_id)
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error deleting resource: {e}")
+        logger.error("Database error deleting resource: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete resource."
@@ -212,15 +352,15 @@ def create_alert(db: Session, alert_in: AlertCreate) -> Alert:
     Create a new alert.
     """
     try:
-        alert = Alert(**alert_in.dict())
+        alert = Alert(**alert_in.model_dump())
         db.add(alert)
         db.commit()
         db.refresh(alert)
-        logger.info(f"Alert created: id={alert.id} for resource_id={alert.resource_id}")
+        logger.info("Alert created: id=%s for resource_id=%s", alert.id, alert.resource_id)
         return alert
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error creating alert: {e}")
+        logger.error("Database error creating alert: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create alert."
@@ -230,41 +370,115 @@ def get_alert(db: Session, alert_id: int) -> Alert:
     """
     Retrieve an alert by ID.
     """
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    alert = db.get(Alert, alert_id)
     if not alert:
-        logger.warning(f"Alert not found: id={alert_id}")
+        logger.warning("Alert not found: id=%s", alert_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Alert not found."
         )
     return alert
 
-def get_alerts(db: Session, status: Optional[str] = None, severity: Optional[str] = None) -> List[Alert]:
+async def get_alert_async(db: AsyncSession, alert_id: int) -> Alert:
     """
-    Retrieve a list of alerts, optionally filtered by status and severity.
+    Async variant of get_alert().
     """
-    query = db.query(Alert)
+    alert = await db.get(Alert, alert_id)
+    if not alert:
+        logger.warning("Alert not found: id=%s", alert_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert not found."
+        )
+    return alert
+
+MAX_PAGE_SIZE = 1000
+
+def get_alerts(
+    db: Session,
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[Alert]:
+    """
+    Retrieve a page of alerts, newest first, optionally filtered by status and severity.
+    """
+    query = db.query(Alert).options(joinedload(Alert.resource))
     if status:
         query = query.filter(Alert.status == status)
     if severity:
         query = query.filter(Alert.severity == severity)
-    return query.order_by(Alert.triggered_at.desc()).all()
+    return (
+        query.order_by(Alert.triggered_at.desc())
+        .offset(skip)
+        .limit(min(limit, MAX_PAGE_SIZE))
+        .all()
+    )
+
+def alerts_rows_stmt(
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Tuple[datetime, int]] = None,
+) -> Select:
+    """
+    Build the Core SELECT for a page of alerts, newest first.
+    Pass the (triggered_at, id) of the last alert seen as `cursor` to
+    continue after it without an O(N) OFFSET scan.
+    """
+    stmt = select(
+        Alert.id,
+        Alert.resource_id,
+        Alert.status,
+        Alert.severity,
+        Alert.message,
+        Alert.delivered_via,
+        Alert.incident_details,
+        Alert.triggered_at,
+        Alert.resolved_at,
+    )
+    if status:
+        stmt = stmt.where(Alert.status == status)
+    if severity:
+        stmt = stmt.where(Alert.severity == severity)
+    if cursor:
+        stmt = stmt.where(tuple_(Alert.triggered_at, Alert.id) < cursor)
+    return (
+        stmt.order_by(Alert.triggered_at.desc(), Alert.id.desc())
+        .offset(skip)
+        .limit(min(limit, MAX_PAGE_SIZE))
+    )
+
+def alerts_signature_stmt(status: Optional[str] = None, severity: Optional[str] = None) -> Select:
+    """
+    Build a cheap aggregate SELECT (row count, sum of row versions and
+    latest trigger time) that changes whenever the filtered alert list does:
+    inserts and deletes move the count, and any update bumps a row_version.
+    """
+    stmt = select(func.count(Alert.id), func.sum(Alert.row_version), func.max(Alert.triggered_at))
+    if status:
+        stmt = stmt.where(Alert.status == status)
+    if severity:
+        stmt = stmt.where(Alert.severity == severity)
+    return stmt
 
 def update_alert(db: Session, alert_id: int, alert_in: AlertUpdate) -> Alert:
     """
     Update an alert (e.g., resolve).
     """
     alert = get_alert(db, alert_id)
-    for field, value in alert_in.dict(exclude_unset=True).items():
+    for field, value in alert_in.model_dump(exclude_unset=True).items():
         setattr(alert, field, value)
     try:
         db.commit()
         db.refresh(alert)
-        logger.info(f"Alert updated: id={alert_id}")
+        logger.info("Alert updated: id=%s", alert_id)
         return alert
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error updating alert: {e}")
+        logger.error("Database error updating alert: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update alert."
@@ -278,10 +492,10 @@ def delete_alert(db: Session, alert_id: int) -> None:
     try:
         db.delete(alert)
         db.commit()
-        logger.info(f"Alert deleted: id={alert_id}")
+        logger.info("Alert deleted: id=%s", alert_id)
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error deleting alert: {e}")
+        logger.error("Database error deleting alert: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete alert."
@@ -294,15 +508,15 @@ def create_audit_log(db: Session, audit_in: AuditLogCreate) -> AuditLog:
     Create a new audit log entry.
     """
     try:
-        audit_log = AuditLog(**audit_in.dict())
+        audit_log = AuditLog(**audit_in.model_dump())
         db.add(audit_log)
         db.commit()
         db.refresh(audit_log)
-        logger.info(f"Audit log created: id={audit_log.id} for alert_id={audit_log.alert_id}")
+        logger.info("Audit log created: id=%s for alert_id=%s", audit_log.id, audit_log.alert_id)
         return audit_log
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Database error creating audit log: {e}")
+        logger.error("Database error creating audit log: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create audit log."
@@ -312,9 +526,9 @@ def get_audit_log(db: Session, audit_log_id: int) -> AuditLog:
     """
     Retrieve an audit log entry by ID.
     """
-    audit_log = db.query(AuditLog).filter(AuditLog.id == audit_log_id).first()
+    audit_log = db.get(AuditLog, audit_log_id)
     if not audit_log:
-        logger.warning(f"Audit log not found: id={audit_log_id}")
+        logger.warning("Audit log not found: id=%s", audit_log_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audit log not found."
@@ -325,7 +539,13 @@ def get_audit_logs(db: Session, skip: int = 0, limit: int = 100) -> List[AuditLo
     """
     Retrieve a list of audit logs.
     """
-    return db.query(AuditLog).order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
+    return (
+        db.query(AuditLog)
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .offset(skip)
+        .limit(min(limit, MAX_PAGE_SIZE))
+        .all()
+    )
 
 # --- Exports ---
 __all__ = [
@@ -335,14 +555,19 @@ __all__ = [
     "update_product",
     "delete_product",
     "create_resource",
+    "create_resources_if_absent",
     "get_resource",
     "get_resource_by_resource_id",
+    "get_existing_resource_ids",
     "get_resources",
     "update_resource",
     "delete_resource",
     "create_alert",
     "get_alert",
+    "get_alert_async",
     "get_alerts",
+    "alerts_rows_stmt",
+    "alerts_signature_stmt",
     "update_alert",
     "delete_alert",
     "create_audit_log",
@@ -1,14 +1,23 @@
+import hashlib
 import logging
 import sys
-from fastapi import FastAPI, Request, status, Depends
-from fastapi.responses import JSONResponse
+from typing import AsyncIterator, List
+
+import orjson
+from fastapi import FastAPI, Request, Response, status, Depends, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from pydantic import TypeAdapter
+from sqlalchemy.sql import Select
 from starlette.background import BackgroundTasks
+from starlette.concurrency import run_in_threadpool
 
 from .config import settings
-from .models import Base, get_engine, get_session
-from .schemas import ProductCreate, ProductUpdate, ProductOut
+from .migrations import upgrade_schema
+from .models import get_engine, get_session, get_async_session, dispose_engine, dispose_async_engine
+from .schemas import ProductCreate, ProductUpdate, ProductOut, AlertResolveMany, ResourceMetrics
 from .crud import (
     create_product,
     get_product,
@@ -16,20 +25,28 @@ from .crud import (
     update_product,
     delete_product,
 )
-from .monitoring import (
-    get_resource_metrics,
-    get_all_resources_metrics,
+from .monitoring_async import (
+    get_resource_metrics_async,
+    get_all_resources_metrics_async,
+    get_metrics_signature_async,
+    close_async_clients,
 )
 from .alerting import (
-    get_alerts,
+    alerts_page_stmt,
+    get_alerts_signature_async,
+    get_alerts_next_cursor_async,
     resolve_alert,
-    get_alert_by_id,
+    resolve_alerts_bulk,
+    get_alert_by_id_async,
+    start_alert_delivery,
+    stop_alert_delivery,
 )
 from .onboarding import (
     trigger_resource_onboarding,
 )
 from .audit import (
-    get_audit_logs,
+    audit_logs_stmt,
+    get_audit_logs_signature_async,
 )
 import uvicorn
 
@@ -48,6 +65,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware (adjust origins as needed)
@@ -62,23 +80,32 @@ app.add_middleware(
 # Database initialization
 @app.on_event("startup")
 def on_startup():
-    engine = get_engine()
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created and application startup complete.")
+    upgrade_schema(get_engine())
+    start_alert_delivery()
+    logger.info("Database schema up to date and application startup complete.")
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # The worker join blocks, so keep it off the event loop
+    await run_in_threadpool(stop_alert_delivery)
+    await close_async_clients()
+    await dispose_async_engine()
+    dispose_engine()
+    logger.info("Application shutdown complete.")
 
 # Exception handlers
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-    logger.error(f"Database error: {exc}")
-    return JSONResponse(
+    logger.error("Database error: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "A database error occurred."},
     )
 
 @app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "An unexpected error occurred."},
     )
@@ -91,6 +118,70 @@ def get_db():
     finally:
         db.close()
 
+# Dependencies for async DB sessions (read-only endpoints). Streaming
+# bodies and metrics fetches open their own sessions from the factory.
+def get_async_db_factory() -> async_sessionmaker:
+    return get_async_session()
+
+async def get_async_db(session_factory=Depends(get_async_db_factory)):
+    async with session_factory() as db:
+        yield db
+
+# --- HTTP Caching ---
+
+_CACHE_CONTROL = "private, max-age=5"
+
+def _make_etag(*parts, weak: bool = False) -> str:
+    """
+    Build an ETag from the given signature parts. Use `weak` when the
+    parts describe the response's inputs rather than its exact bytes.
+    """
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+def _not_modified(request: Request, etag: str):
+    """
+    Return a 304 response if the client already holds `etag`, else None.
+    If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL},
+        )
+    return None
+
+# --- Streaming Responses ---
+
+# Naive timestamps in the database are UTC; label them so clients need not guess
+_ORJSON_TIMESTAMPS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+async def _stream_json_rows(stmt: Select, session_factory: async_sessionmaker) -> AsyncIterator[bytes]:
+    """
+    Stream the rows of `stmt` as a JSON array, encoding one row at a time
+    so memory stays flat regardless of page size. Uses its own session
+    because the body is produced after the endpoint has returned.
+    """
+    async with session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=500))
+        yield b"["
+        separator = b""
+        async for row in result.mappings():
+            yield separator + orjson.dumps(dict(row), option=_ORJSON_TIMESTAMPS)
+            separator = b","
+        yield b"]"
+
+def _timestamped_json(payload: dict) -> Response:
+    """
+    Encode a single object with the same timestamp options as the streamed
+    lists, so one alert serializes identically in both places.
+    """
+    return Response(content=orjson.dumps(payload, option=_ORJSON_TIMESTAMPS), media_type="application/json")
+
 # --- Product CRUD Endpoints ---
 
 @app.post("/products/", response_model=ProductOut, status_code=status.HTTP_201_CREATED, tags=["Products"])
@@ -131,42 +222,104 @@ def api_delete_product(product_id: int, db=Depends(get_db)):
 
 # --- Monitoring Endpoints ---
 
-@app.get("/metrics/resources/", tags=["Monitoring"])
-def api_get_all_resources_metrics():
+# Serialize metrics in one pydantic-core pass rather than via jsonable_encoder
+_RESOURCE_METRICS_LIST = TypeAdapter(List[ResourceMetrics])
+
+@app.get("/metrics/resources/", response_model=list[ResourceMetrics], tags=["Monitoring"])
+async def api_get_all_resources_metrics(
+    request: Request,
+    db=Depends(get_async_db),
+    session_factory=Depends(get_async_db_factory),
+):
     """
     Get metrics for all monitored resources.
+    Honours If-None-Match; the ETag changes with the monitored resource
+    set and once per metrics period.
     """
-    return get_all_resources_metrics()
+    # The signature covers the resource set and period, not the datapoints
+    # themselves, so two bodies under one tag are only equivalent: weak
+    etag = _make_etag(*await get_metrics_signature_async(db), weak=True)
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    results, fetch_failed = await get_all_resources_metrics_async(session_factory)
+    # Don't let clients pin a response with gaps from a failed backend call
+    # for the rest of the period
+    headers = None if fetch_failed else {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    return Response(
+        content=_RESOURCE_METRICS_LIST.dump_json(results),
+        media_type="application/json",
+        headers=headers,
+    )
 
-@app.get("/metrics/resources/{resource_id}", tags=["Monitoring"])
-def api_get_resource_metrics(resource_id: str):
+@app.get("/metrics/resources/{resource_id}", response_model=ResourceMetrics, tags=["Monitoring"])
+async def api_get_resource_metrics(resource_id: str, session_factory=Depends(get_async_db_factory)):
     """
     Get metrics for a specific resource.
     """
-    return get_resource_metrics(resource_id)
+    metrics = await get_resource_metrics_async(resource_id, session_factory)
+    return Response(content=metrics.model_dump_json(), media_type="application/json")
 
 # --- Alerting Endpoints ---
 
 @app.get("/alerts/", tags=["Alerting"])
-def api_get_alerts(status: str = None, severity: str = None, db=Depends(get_db)):
+async def api_get_alerts(
+    request: Request,
+    status: str = None,
+    severity: str = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str = None,
+    db=Depends(get_async_db),
+    session_factory=Depends(get_async_db_factory),
+):
     """
-    Get all alerts, optionally filtered by status or severity.
+    Get a page of alerts, optionally filtered by status or severity.
+    When the page is full, the X-Next-Cursor header holds the `cursor`
+    value for the next page. Honours If-None-Match.
     """
-    return get_alerts(db, status=status, severity=severity)
+    # The body streams from its own session after this handler returns, so
+    # it is read in a later snapshot than the signature. It is never older
+    # than the ETag: a write landing in between only means the client gets
+    # newer rows under the older tag, and its next conditional request
+    # misses and refetches once. It can never produce a stale 304.
+    signature = await get_alerts_signature_async(db, status=status, severity=severity)
+    etag = _make_etag(*signature, status, severity, skip, limit, cursor)
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    stmt = alerts_page_stmt(status=status, severity=severity, skip=skip, limit=limit, cursor=cursor)
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    next_cursor = await get_alerts_next_cursor_async(
+        db, status=status, severity=severity, skip=skip, limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return StreamingResponse(
+        _stream_json_rows(stmt, session_factory), media_type="application/json", headers=headers
+    )
 
 @app.get("/alerts/{alert_id}", tags=["Alerting"])
-def api_get_alert_by_id(alert_id: int, db=Depends(get_db)):
+async def api_get_alert_by_id(alert_id: int, db=Depends(get_async_db)):
     """
     Get a specific alert by ID.
     """
-    return get_alert_by_id(db, alert_id)
+    return _timestamped_json((await get_alert_by_id_async(db, alert_id)).model_dump())
+
+@app.post("/alerts/resolve_many", tags=["Alerting"])
+def api_resolve_alerts_bulk(payload: AlertResolveMany, db=Depends(get_db)):
+    """
+    Resolve several alerts at once and log each resolution.
+    Returns the IDs that were resolved by this request.
+    """
+    return {"resolved": resolve_alerts_bulk(db, payload.alert_ids)}
 
 @app.post("/alerts/{alert_id}/resolve", tags=["Alerting"])
 def api_resolve_alert(alert_id: int, db=Depends(get_db)):
     """
     Resolve an alert and log the resolution.
     """
-    return resolve_alert(db, alert_id)
+    return _timestamped_json(resolve_alert(db, alert_id).model_dump())
 
 # --- Resource Onboarding Endpoint ---
 
@@ -181,16 +334,31 @@ def api_trigger_resource_onboarding(background_tasks: BackgroundTasks):
 # --- Audit Log Endpoint ---
 
 @app.get("/audit/logs/", tags=["Audit"])
-def api_get_audit_logs(skip: int = 0, limit: int = 100, db=Depends(get_db)):
+async def api_get_audit_logs(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db=Depends(get_async_db),
+    session_factory=Depends(get_async_db_factory),
+):
     """
     Retrieve audit logs for alert generation and resolution.
+    Honours If-None-Match.
     """
-    return get_audit_logs(db, skip=skip, limit=limit)
+    etag = _make_etag(*await get_audit_logs_signature_async(db), skip, limit)
+    cached = _not_modified(request, etag)
+    if cached:
+        return cached
+    return StreamingResponse(
+        _stream_json_rows(audit_logs_stmt(skip, limit), session_factory),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL},
+    )
 
 # --- Health Check Endpoint ---
 
 @app.get("/health", tags=["Health"])
-def health_check():
+async def health_check():
     """
     Health check endpoint.
     """
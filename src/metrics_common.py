@@ -0,0 +1,163 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Union
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from .models import Resource
+from .schemas import ResourceMetrics, MetricData
+
+# Backend-neutral pieces of the metrics pipeline: request builders, result
+# bucketing and response shaping. No client I/O happens here, so both the
+# sync (monitoring.py) and async (monitoring_async.py) integrations use them.
+
+# Datapoint granularity requested from the monitoring backends
+METRICS_PERIOD_SECONDS = 300
+
+# CloudWatch GetMetricData accepts at most 500 queries per request
+CLOUDWATCH_MAX_QUERIES = 500
+
+# Resources matched per Prometheus range query, keeping the request URL bounded
+PROMETHEUS_MAX_INSTANCES_PER_QUERY = 200
+
+# Monitored resources are streamed from the database in partitions of this size
+RESOURCE_PARTITION_SIZE = 500
+
+# --- Raw Datapoints ---
+
+@dataclass(slots=True)
+class RawMetric:
+    """
+    Datapoint as returned by a monitoring backend. Backends only report
+    CPU today; values are trusted, so they skip Pydantic validation and
+    become MetricData once, at the response boundary. The timestamp is
+    kept as the backend delivered it: a datetime from CloudWatch, UNIX
+    epoch seconds from Prometheus.
+    """
+    timestamp: Union[datetime, float]
+    cpu: Optional[float] = None
+    memory: Optional[float] = None
+    network: Optional[float] = None
+    storage: Optional[float] = None
+
+@dataclass(slots=True)
+class MetricsBatch:
+    """
+    Datapoints keyed by resource_id, plus whether any backend request
+    behind them failed. A resource with no datapoints is ambiguous on its
+    own (idle, or unreachable backend); `failed` tells the two apart.
+    """
+    metrics: Dict[str, List[RawMetric]] = field(default_factory=dict)
+    failed: bool = False
+
+    def merge(self, other: "MetricsBatch") -> None:
+        self.metrics.update(other.metrics)
+        self.failed = self.failed or other.failed
+
+def to_resource_metrics(resource_id: str, raws: List[RawMetric]) -> ResourceMetrics:
+    """
+    Build the response model for one resource without re-validating.
+    """
+    return ResourceMetrics.model_construct(
+        resource_id=resource_id,
+        metrics=[
+            MetricData.model_construct(
+                timestamp=(
+                    r.timestamp if isinstance(r.timestamp, datetime)
+                    else datetime.fromtimestamp(r.timestamp, timezone.utc)
+                ),
+                cpu=r.cpu,
+                memory=r.memory,
+                network=r.network,
+                storage=r.storage,
+            )
+            for r in raws
+        ],
+    )
+
+def resource_ref_stmt() -> Select:
+    # The fetchers only read these two attributes, so plain rows stand in for
+    # Resource instances; they are immutable and safe to share across threads
+    return select(Resource.cloud_provider, Resource.resource_id)
+
+# --- CloudWatch ---
+
+def cloudwatch_queries(chunk: list) -> List[Dict[str, Any]]:
+    """
+    Build GetMetricData queries for up to CLOUDWATCH_MAX_QUERIES resources.
+    Query IDs encode the resource's index in `chunk`.
+    """
+    return [
+        {
+            "Id": f"m{i}",
+            "MetricStat": {
+                "Metric": {
+                    "Namespace": "AWS/EC2",
+                    "MetricName": "CPUUtilization",
+                    "Dimensions": [{"Name": "InstanceId", "Value": resource.resource_id}],
+                },
+                "Period": METRICS_PERIOD_SECONDS,
+                "Stat": "Average",
+            },
+        }
+        for i, resource in enumerate(chunk)
+    ]
+
+def bucket_cloudwatch_page(chunk: list, page: dict, results: Dict[str, List[RawMetric]]) -> None:
+    """
+    Add the datapoints of one GetMetricData page to `results`, keyed by
+    the resource_id of the query that produced them.
+    """
+    for series in page.get("MetricDataResults", []):
+        resource_id = chunk[int(series["Id"][1:])].resource_id
+        results.setdefault(resource_id, []).extend(
+            RawMetric(timestamp, value)
+            for timestamp, value in zip(series.get("Timestamps", []), series.get("Values", []))
+        )
+
+# --- Prometheus ---
+
+def _promql_instance_regex(resource_ids: List[str]) -> str:
+    # re.escape backslashes must themselves be escaped inside a PromQL string literal
+    pattern = "|".join(re.escape(resource_id) for resource_id in resource_ids)
+    return pattern.replace("\\", "\\\\").replace('"', '\\"')
+
+def prometheus_bulk_query(chunk: list) -> str:
+    """
+    Build the CPU range query matching every resource in `chunk`.
+    """
+    instances = _promql_instance_regex([r.resource_id for r in chunk])
+    return f'instance:node_cpu_utilisation:avg1m{{instance=~"{instances}"}}'
+
+def bucket_prometheus_series(result: List[dict]) -> Dict[str, List[RawMetric]]:
+    """
+    Group a range query result by its instance label.
+    """
+    results: Dict[str, List[RawMetric]] = {}
+    for series in result:
+        instance = series.get("metric", {}).get("instance")
+        if instance is None:
+            continue
+        results.setdefault(instance, []).extend(
+            RawMetric(value[0], float(value[1]))
+            for value in series.get("values", [])
+        )
+    return results
+
+# --- Exports ---
+__all__ = [
+    "METRICS_PERIOD_SECONDS",
+    "CLOUDWATCH_MAX_QUERIES",
+    "PROMETHEUS_MAX_INSTANCES_PER_QUERY",
+    "RESOURCE_PARTITION_SIZE",
+    "RawMetric",
+    "MetricsBatch",
+    "to_resource_metrics",
+    "resource_ref_stmt",
+    "cloudwatch_queries",
+    "bucket_cloudwatch_page",
+    "prometheus_bulk_query",
+    "bucket_prometheus_series",
+]
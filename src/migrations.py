@@ -0,0 +1,147 @@
+import logging
+from typing import Callable, List, Tuple
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Connection, Engine
+
+from .models import Alert, AlertSeverity, AlertStatus, AuditLog, Base, ResourceType
+
+logger = logging.getLogger("migrations")
+
+# Base.metadata.create_all() only creates missing tables; it never alters
+# existing ones. Databases created by an older release are brought up to
+# date by the ordered steps below, each applied once and recorded.
+
+# --- Migration Ledger ---
+# Kept out of Base.metadata so the model never creates or drops it
+_ledger_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _ledger_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(128), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+# Serializes upgrades from concurrently starting replicas on PostgreSQL
+_ADVISORY_LOCK_KEY = 0x6D6F6E69
+
+# --- Steps ---
+
+def _column_types(conn: Connection, table: str) -> dict:
+    return {column["name"]: column["type"] for column in inspect(conn).get_columns(table)}
+
+def _postgresql_only(conn: Connection, name: str) -> bool:
+    if conn.dialect.name == "postgresql":
+        return True
+    logger.warning(
+        "Schema migration '%s' is only automated on PostgreSQL; recreate this %s database "
+        "to pick it up.", name, conn.dialect.name,
+    )
+    return False
+
+def _add_alert_row_version(conn: Connection) -> None:
+    if "row_version" not in _column_types(conn, "alerts"):
+        conn.execute(text("ALTER TABLE alerts ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1"))
+
+# Columns formerly declared as Enum(...), which stored member NAMES ("OPEN")
+# and, on PostgreSQL, used a native enum type
+_ENUM_COLUMNS = [
+    ("resources", "type", ResourceType, "resourcetype", "ck_resources_type"),
+    ("alerts", "status", AlertStatus, "alertstatus", "ck_alerts_status"),
+    ("alerts", "severity", AlertSeverity, "alertseverity", "ck_alerts_severity"),
+]
+
+def _enum_values_with_checks(conn: Connection) -> None:
+    for table, column, enum_cls, type_name, check_name in _ENUM_COLUMNS:
+        if conn.dialect.name != "postgresql":
+            conn.execute(text(f"UPDATE {table} SET {column} = lower({column})"))
+            continue
+        if isinstance(_column_types(conn, table)[column], Enum):
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(16) USING lower({column}::text)"
+            ))
+            conn.execute(text(f"DROP TYPE IF EXISTS {type_name}"))
+        checks = {check["name"] for check in inspect(conn).get_check_constraints(table)}
+        if check_name not in checks:
+            allowed = ", ".join(f"'{member.value}'" for member in enum_cls)
+            conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {check_name} CHECK ({column} IN ({allowed}))"))
+    if conn.dialect.name != "postgresql":
+        logger.warning("CHECK constraints on enum columns are only added to new %s databases.", conn.dialect.name)
+
+# (table, column, filled by the server on INSERT)
+_TIMESTAMP_COLUMNS = [
+    ("products", "created_at", True),
+    ("products", "updated_at", True),
+    ("resources", "created_at", True),
+    ("resources", "updated_at", True),
+    ("alerts", "triggered_at", True),
+    ("alerts", "resolved_at", False),
+    ("audit_logs", "created_at", True),
+]
+
+def _timestamps_with_server_defaults(conn: Connection) -> None:
+    if not _postgresql_only(conn, "timezone-aware timestamps with server defaults"):
+        return
+    for table, column, server_default in _TIMESTAMP_COLUMNS:
+        if not getattr(_column_types(conn, table)[column], "timezone", False):
+            # Existing naive values were written with utcnow()
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE TIMESTAMP WITH TIME ZONE "
+                f"USING {column} AT TIME ZONE 'UTC'"
+            ))
+        if server_default:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now()"))
+
+def _json_documents_as_jsonb(conn: Connection) -> None:
+    if not _postgresql_only(conn, "JSON documents as JSONB"):
+        return
+    for table, column in [("alerts", "incident_details"), ("audit_logs", "event_details")]:
+        column_type = _column_types(conn, table)[column]
+        if isinstance(column_type, JSON) and not isinstance(column_type, JSONB):
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"))
+
+def _alert_listing_indexes(conn: Connection) -> None:
+    # Superseded by the composite (status, severity, triggered_at) index
+    conn.execute(text("DROP INDEX IF EXISTS ix_alerts_status"))
+    for index in [*Alert.__table__.indexes, *AuditLog.__table__.indexes]:
+        index.create(conn, checkfirst=True)
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "add alerts.row_version", _add_alert_row_version),
+    (2, "store enum values with CHECK constraints", _enum_values_with_checks),
+    (3, "timezone-aware timestamps with server defaults", _timestamps_with_server_defaults),
+    (4, "store JSON documents as JSONB", _json_documents_as_jsonb),
+    (5, "create alert and audit log listing indexes", _alert_listing_indexes),
+]
+
+# --- Upgrade ---
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Bring the database schema up to date with the models. A fresh database
+    is created from the models and every step is recorded as applied;
+    an existing one runs its pending steps, all in one transaction.
+    """
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        fresh = not inspect(conn).has_table("alerts")
+        schema_migrations.create(conn, checkfirst=True)
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+        for version, name, step in MIGRATIONS:
+            if version in applied:
+                continue
+            if not fresh:
+                logger.info("Applying schema migration %s: %s", version, name)
+                step(conn)
+            conn.execute(schema_migrations.insert().values(version=version, name=name))
+        # Creates tables that did not exist yet; existing ones are left alone
+        Base.metadata.create_all(conn)
+
+# --- Exports ---
+__all__ = [
+    "MIGRATIONS",
+    "upgrade_schema",
+]
@@ -1,4 +1,5 @@
-from datetime import datetime
+import sys
+import threading
 from typing import Optional
 
 from sqlalchemy import (
@@ -9,11 +10,19 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
-    Enum,
+    CheckConstraint,
     JSON,
     create_engine,
     Text,
+    Index,
+    func,
+    literal_column,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import (
     declarative_base,
     relationship,
@@ -21,6 +30,7 @@ from sqlalchemy.orm import (
     scoped_session,
 )
 import enum
+import orjson
 
 from .config import settings
 
@@ -28,19 +38,113 @@ from .config import settings
 Base = declarative_base()
 
 # --- Database Engine and Session ---
-def get_engine():
+def _json_serializer(value) -> str:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+def _engine_kwargs() -> dict:
+    engine_kwargs = {
+        "pool_pre_ping": True,
+        "insertmanyvalues_page_size": 1000,
+        # JSON/JSONB columns encode and decode with orjson instead of stdlib json
+        "json_serializer": _json_serializer,
+        "json_deserializer": orjson.loads,
+    }
+    if make_url(settings.DATABASE_URL).get_backend_name() != "sqlite":
+        # SQLite uses single-connection pools that reject these options
+        engine_kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_use_lifo=True,
+        )
+    return engine_kwargs
+
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_engine_lock = threading.RLock()
+
+def get_engine() -> Engine:
+    """
+    Returns the process-wide SQLAlchemy engine, creating it on first use.
     """
-    Returns a SQLAlchemy engine instance.
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(settings.DATABASE_URL, future=True, **_engine_kwargs())
+    return _engine
+
+def get_sessionmaker() -> sessionmaker:
+    """
+    Returns the session factory bound to the shared engine.
     """
-    return create_engine(settings.DATABASE_URL, pool_pre_ping=True, future=True)
+    global _session_factory
+    if _session_factory is None:
+        with _engine_lock:
+            if _session_factory is None:
+                _session_factory = sessionmaker(
+                    bind=get_engine(), autoflush=False, autocommit=False, future=True
+                )
+    return _session_factory
 
 def get_session():
     """
     Returns a SQLAlchemy session instance.
     """
-    engine = get_engine()
-    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-    return scoped_session(session_factory)
+    return scoped_session(get_sessionmaker())
+
+def dispose_engine() -> None:
+    """
+    Close all pooled connections held by the engine, if it was created.
+    """
+    global _engine, _session_factory
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+            _session_factory = None
+
+# --- Async Database Engine and Session ---
+# Async drivers substituted for the configured sync driver of each backend
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+}
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Returns the process-wide async SQLAlchemy engine, creating it on first use.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = make_url(settings.DATABASE_URL)
+        url = url.set(drivername=_ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+        _async_engine = create_async_engine(url, **_engine_kwargs())
+    return _async_engine
+
+def get_async_session() -> async_sessionmaker:
+    """
+    Returns the async session factory bound to the async engine.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+async def dispose_async_engine() -> None:
+    """
+    Close all pooled connections held by the async engine, if it was created.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
 
 # --- Enums ---
 class AlertStatus(str, enum.Enum):
@@ -61,18 +165,54 @@ class ResourceType(str, enum.Enum):
     NETWORK = "network"
     OTHER = "other"
 
+# --- Column Types ---
+class FastEnum(TypeDecorator):
+    """
+    Stores a str-valued Enum as its plain value in a VARCHAR and loads it
+    back as an interned str, skipping the per-row Enum lookup. Members of
+    str enums compare equal to their values, so callers can keep comparing
+    against AlertStatus.OPEN etc.; schemas coerce to the Enum on output.
+    """
+    impl = String(16)
+    cache_ok = True
+
+    def __init__(self, enum_cls, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_cls = enum_cls
+        self._values = frozenset(member.value for member in enum_cls)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, enum.Enum):
+            value = value.value
+        if value not in self._values:
+            raise ValueError(f"{value!r} is not a valid {self.enum_cls.__name__}")
+        return value
+
+    def process_result_value(self, value, dialect):
+        return sys.intern(value) if value is not None else None
+
+# Binary JSONB on PostgreSQL (parsed once on write); plain JSON elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+def _enum_check(column: str, enum_cls, name: str) -> CheckConstraint:
+    allowed = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({allowed})", name=name)
+
 # --- Product Model ---
 class Product(Base):
     """
     Product entity for CRUD operations.
     """
     __tablename__ = "products"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(128), nullable=False, unique=True, index=True)
     description = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     # Add more fields as needed
 
 # --- Resource Model ---
@@ -81,16 +221,21 @@ class Resource(Base):
     Cloud resource being monitored.
     """
     __tablename__ = "resources"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     resource_id = Column(String(128), unique=True, nullable=False, index=True)
     name = Column(String(128), nullable=False)
-    type = Column(Enum(ResourceType), nullable=False)
+    type = Column(
+        FastEnum(ResourceType),
+        _enum_check("type", ResourceType, "ck_resources_type"),
+        nullable=False,
+    )
     cloud_provider = Column(String(64), nullable=False)
     onboarded = Column(Boolean, default=False, nullable=False)
     monitoring_enabled = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     # Relationships
     alerts = relationship("Alert", back_populates="resource", cascade="all, delete-orphan")
 
@@ -100,16 +245,36 @@ class Alert(Base):
     Alert generated for resource threshold breach or security event.
     """
     __tablename__ = "alerts"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     resource_id = Column(Integer, ForeignKey("resources.id"), nullable=False)
-    status = Column(Enum(AlertStatus), default=AlertStatus.OPEN, nullable=False, index=True)
-    severity = Column(Enum(AlertSeverity), default=AlertSeverity.INFO, nullable=False, index=True)
+    status = Column(
+        FastEnum(AlertStatus),
+        _enum_check("status", AlertStatus, "ck_alerts_status"),
+        default=AlertStatus.OPEN,
+        nullable=False,
+    )
+    severity = Column(
+        FastEnum(AlertSeverity),
+        _enum_check("severity", AlertSeverity, "ck_alerts_severity"),
+        default=AlertSeverity.INFO,
+        nullable=False,
+        index=True,
+    )
     message = Column(Text, nullable=False)
-    triggered_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    resolved_at = Column(DateTime, nullable=True)
+    triggered_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    resolved_at = Column(DateTime(timezone=True), nullable=True)
     delivered_via = Column(String(64), nullable=True)  # e.g., 'email', 'slack'
-    incident_details = Column(JSON, nullable=True)
+    incident_details = Column(JSONDocument, nullable=True)
+    # Bumped by every UPDATE (ORM or Core) so list validators see any row change
+    row_version = Column(
+        Integer,
+        default=1,
+        server_default=text("1"),
+        onupdate=literal_column("row_version + 1"),
+        nullable=False,
+    )
     # Relationships
     resource = relationship("Resource", back_populates="alerts")
     audit_logs = relationship("AuditLog", back_populates="alert", cascade="all, delete-orphan")
@@ -120,21 +285,59 @@ class AuditLog(Base):
     Immutable audit log for alert generation and resolution.
     """
     __tablename__ = "audit_logs"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     alert_id = Column(Integer, ForeignKey("alerts.id"), nullable=False)
     event_type = Column(String(64), nullable=False)  # e.g., 'generated', 'resolved', 'security'
-    event_details = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    event_details = Column(JSONDocument, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     actor = Column(String(128), nullable=True)  # e.g., system, user, service
     # Relationships
     alert = relationship("Alert", back_populates="audit_logs")
 
+# --- Indexes ---
+# Serve the newest-first alert listing and its (triggered_at, id) keyset
+# cursor without a separate sort step
+Index(
+    "ix_alerts_status_severity_triggered_at",
+    Alert.status,
+    Alert.severity,
+    Alert.triggered_at.desc(),
+    Alert.id.desc(),
+)
+Index("ix_alerts_triggered_at", Alert.triggered_at.desc(), Alert.id.desc())
+# Open alerts are the bulk of dashboard reads but a small share of the table
+Index(
+    "ix_alerts_open_severity_triggered_at",
+    Alert.severity,
+    Alert.triggered_at.desc(),
+    Alert.id.desc(),
+    postgresql_where=text("status = 'open'"),
+    sqlite_where=text("status = 'open'"),
+)
+# Per-resource alert history; severity is INCLUDEd on PostgreSQL, but the
+# unbounded message text is not, since it could exceed the btree tuple limit
+Index(
+    "ix_alerts_resource_status_triggered_at",
+    Alert.resource_id,
+    Alert.status,
+    Alert.triggered_at.desc(),
+    postgresql_include=["severity"],
+)
+Index("ix_audit_logs_created_at", AuditLog.created_at.desc())
+Index("ix_audit_logs_alert_created_at", AuditLog.alert_id, AuditLog.created_at)
+
 # --- Exports ---
 __all__ = [
     "Base",
     "get_engine",
+    "get_sessionmaker",
     "get_session",
+    "dispose_engine",
+    "get_async_engine",
+    "get_async_session",
+    "dispose_async_engine",
     "Product",
     "Resource",
     "Alert",
@@ -142,4 +345,5 @@ __all__ = [
     "AlertStatus",
     "AlertSeverity",
     "ResourceType",
+    "FastEnum",
 ]
\ No newline at end of file
@@ -1,9 +1,28 @@
 import logging
-from typing import List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 
-from .models import Resource, get_session
-from .schemas import ResourceMetrics, MetricData
+from sqlalchemy import func, select
+
+from .cache import metrics_cache_get, metrics_cache_put, provider_cache_get, provider_cache_put, refresh_provider_cache
+from .metrics_common import (
+    CLOUDWATCH_MAX_QUERIES,
+    METRICS_PERIOD_SECONDS,
+    PROMETHEUS_MAX_INSTANCES_PER_QUERY,
+    RESOURCE_PARTITION_SIZE,
+    RawMetric,
+    bucket_cloudwatch_page,
+    bucket_prometheus_series,
+    cloudwatch_queries,
+    prometheus_bulk_query,
+    resource_ref_stmt,
+    to_resource_metrics,
+)
+from .models import Resource, get_sessionmaker
+from .schemas import ResourceMetrics
 
 from .config import settings
 
@@ -11,20 +30,54 @@ from .config import settings
 # In production, these should be securely configured and credentials managed via environment variables/secrets.
 try:
     import boto3
+    from botocore.config import Config as BotoConfig
     from botocore.exceptions import BotoCoreError, ClientError
 except ImportError:
     boto3 = None
 
 try:
     from prometheus_api_client import PrometheusConnect
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     PrometheusConnect = None
 
 logger = logging.getLogger("monitoring")
 
+# Backend calls block, so the sync entry points fan partitions out to a
+# bounded pool; its size also caps concurrent requests per backend.
+_fetch_executor = ThreadPoolExecutor(
+    max_workers=settings.MONITORING_CONCURRENCY, thread_name_prefix="metrics-fetch"
+)
+
 # --- Cloud-Native Monitoring Integration ---
 
-def fetch_aws_cloudwatch_metrics(resource: Resource) -> List[MetricData]:
+_cloudwatch = None
+_cloudwatch_lock = threading.Lock()
+
+def _get_cloudwatch():
+    """
+    Return the shared CloudWatch client. boto3 clients are thread-safe, so
+    one client (and its connection pool) serves every fetch thread.
+    """
+    global _cloudwatch
+    if _cloudwatch is None:
+        with _cloudwatch_lock:
+            if _cloudwatch is None:
+                _cloudwatch = boto3.client(
+                    "cloudwatch",
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.AWS_REGION,
+                    config=BotoConfig(
+                        max_pool_connections=max(settings.MONITORING_CONCURRENCY, 10),
+                        retries={"mode": "adaptive", "max_attempts": 5},
+                        tcp_keepalive=True,
+                    ),
+                )
+    return _cloudwatch
+
+def fetch_aws_cloudwatch_metrics(resource: Resource) -> List[RawMetric]:
     """
     Fetch metrics from AWS CloudWatch for a given resource.
     """
@@ -32,12 +85,7 @@ def fetch_aws_cloudwatch_metrics(resource: Resource) -> List[MetricData]:
         logger.error("boto3 is not installed. AWS CloudWatch integration unavailable.")
         return []
     try:
-        cloudwatch = boto3.client(
-            "cloudwatch",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION,
-        )
+        cloudwatch = _get_cloudwatch()
         # Example: Fetch CPUUtilization for EC2 instance
         metrics = []
         end_time = datetime.utcnow()
@@ -48,26 +96,68 @@ def fetch_aws_cloudwatch_metrics(resource: Resource) -> List[MetricData]:
             Dimensions=[{"Name": "InstanceId", "Value": resource.resource_id}],
             StartTime=start_time,
             EndTime=end_time,
-            Period=300,
+            Period=METRICS_PERIOD_SECONDS,
             Statistics=["Average"],
         )
         for datapoint in response.get("Datapoints", []):
-            metrics.append(
-                MetricData(
-                    timestamp=datapoint["Timestamp"],
-                    cpu=datapoint.get("Average"),
-                    memory=None,
-                    network=None,
-                    storage=None,
-                )
-            )
-        logger.info(f"Fetched {len(metrics)} CloudWatch metrics for resource {resource.resource_id}")
+            metrics.append(RawMetric(datapoint["Timestamp"], datapoint.get("Average")))
+        logger.info("Fetched %s CloudWatch metrics for resource %s", len(metrics), resource.resource_id)
         return metrics
     except (BotoCoreError, ClientError) as e:
-        logger.error(f"Error fetching CloudWatch metrics: {e}")
+        logger.error("Error fetching CloudWatch metrics: %s", e)
         return []
 
-def fetch_prometheus_metrics(resource: Resource) -> List[MetricData]:
+def fetch_aws_cloudwatch_metrics_bulk(resources: List[Resource]) -> Dict[str, List[RawMetric]]:
+    """
+    Fetch CloudWatch metrics for many resources with GetMetricData,
+    packing up to CLOUDWATCH_MAX_QUERIES resources into each request.
+    Returns metrics keyed by resource_id.
+    """
+    if not boto3:
+        logger.error("boto3 is not installed. AWS CloudWatch integration unavailable.")
+        return {}
+    cloudwatch = _get_cloudwatch()
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(minutes=60)
+    paginator = cloudwatch.get_paginator("get_metric_data")
+    results: Dict[str, List[RawMetric]] = {}
+    for offset in range(0, len(resources), CLOUDWATCH_MAX_QUERIES):
+        chunk = resources[offset:offset + CLOUDWATCH_MAX_QUERIES]
+        try:
+            for page in paginator.paginate(
+                MetricDataQueries=cloudwatch_queries(chunk), StartTime=start_time, EndTime=end_time
+            ):
+                bucket_cloudwatch_page(chunk, page, results)
+        except (BotoCoreError, ClientError) as e:
+            logger.error("Error fetching CloudWatch metrics for %s resources: %s", len(chunk), e)
+    logger.info("Fetched CloudWatch metrics for %s resources.", len(resources))
+    return results
+
+_prom: Optional["PrometheusConnect"] = None
+_prom_lock = threading.Lock()
+
+def _get_prometheus() -> "PrometheusConnect":
+    """
+    Return the shared Prometheus client, so its HTTP session and
+    keep-alive connections are reused across calls.
+    """
+    global _prom
+    if _prom is None:
+        with _prom_lock:
+            if _prom is None:
+                prom = PrometheusConnect(url=str(settings.PROMETHEUS_URL).rstrip("/"), disable_ssl=True)
+                # The default adapter keeps only 10 connections, fewer than the fetch threads
+                adapter = HTTPAdapter(
+                    pool_connections=32,
+                    pool_maxsize=max(settings.MONITORING_CONCURRENCY, 10),
+                    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+                )
+                prom._session.mount("http://", adapter)
+                prom._session.mount("https://", adapter)
+                _prom = prom
+    return _prom
+
+def fetch_prometheus_metrics(resource: Resource) -> List[RawMetric]:
     """
     Fetch metrics from Prometheus for a given resource.
     """
@@ -75,13 +165,13 @@ def fetch_prometheus_metrics(resource: Resource) -> List[MetricData]:
         logger.error("prometheus_api_client is not installed. Prometheus integration unavailable.")
         return []
     try:
-        prom = PrometheusConnect(url=settings.PROMETHEUS_URL, disable_ssl=True)
+        prom = _get_prometheus()
         metrics = []
         # Example: Query CPU usage for a VM
         query = f'instance:node_cpu_utilisation:avg1m{{instance="{resource.resource_id}"}}'
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(minutes=60)
-        step = 300  # 5 minutes
+        step = METRICS_PERIOD_SECONDS
         result = prom.custom_query_range(
             query=query,
             start_time=start_time,
@@ -90,22 +180,54 @@ def fetch_prometheus_metrics(resource: Resource) -> List[MetricData]:
         )
         for series in result:
             for value in series.get("values", []):
-                metrics.append(
-                    MetricData(
-                        timestamp=datetime.utcfromtimestamp(float(value[0])),
-                        cpu=float(value[1]),
-                        memory=None,
-                        network=None,
-                        storage=None,
-                    )
-                )
-        logger.info(f"Fetched {len(metrics)} Prometheus metrics for resource {resource.resource_id}")
+                metrics.append(RawMetric(value[0], float(value[1])))
+        logger.info("Fetched %s Prometheus metrics for resource %s", len(metrics), resource.resource_id)
         return metrics
     except Exception as e:
-        logger.error(f"Error fetching Prometheus metrics: {e}")
+        logger.error("Error fetching Prometheus metrics: %s", e)
         return []
 
-def fetch_metrics_for_resource(resource: Resource) -> List[MetricData]:
+def fetch_prometheus_metrics_bulk(resources: List[Resource]) -> Dict[str, List[RawMetric]]:
+    """
+    Fetch Prometheus metrics for many resources with one range query per
+    PROMETHEUS_MAX_INSTANCES_PER_QUERY resources, matching instances by
+    regex. Returns metrics keyed by resource_id.
+    """
+    if not PrometheusConnect:
+        logger.error("prometheus_api_client is not installed. Prometheus integration unavailable.")
+        return {}
+    prom = _get_prometheus()
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(minutes=60)
+    results: Dict[str, List[RawMetric]] = {}
+    for offset in range(0, len(resources), PROMETHEUS_MAX_INSTANCES_PER_QUERY):
+        chunk = resources[offset:offset + PROMETHEUS_MAX_INSTANCES_PER_QUERY]
+        try:
+            result = prom.custom_query_range(
+                query=prometheus_bulk_query(chunk),
+                start_time=start_time,
+                end_time=end_time,
+                step=METRICS_PERIOD_SECONDS,
+            )
+        except Exception as e:
+            logger.error("Error fetching Prometheus metrics for %s resources: %s", len(chunk), e)
+            continue
+        results.update(bucket_prometheus_series(result))
+    logger.info("Fetched Prometheus metrics for %s resources.", len(resources))
+    return results
+
+def fetch_metrics_for_resource(resource: Resource) -> List[RawMetric]:
+    """
+    Fetch metrics for a resource, serving recent results from the cache.
+    """
+    cached = metrics_cache_get(resource)
+    if cached is not None:
+        return cached
+    metrics = _fetch_metrics_uncached(resource)
+    metrics_cache_put(resource, metrics)
+    return metrics
+
+def _fetch_metrics_uncached(resource: Resource) -> List[RawMetric]:
     """
     Fetch metrics for a resource from the appropriate monitoring backend.
     """
@@ -115,36 +237,97 @@ def fetch_metrics_for_resource(resource: Resource) -> List[MetricData]:
     elif resource.cloud_provider.lower() == "prometheus":
         return fetch_prometheus_metrics(resource)
     # Add more cloud providers as needed (Azure, GCP, etc.)
-    logger.warning(f"No monitoring integration for provider: {resource.cloud_provider}")
+    logger.warning("No monitoring integration for provider: %s", resource.cloud_provider)
     return []
 
+# --- Entry Points ---
+
 def get_resource_metrics(resource_id: str) -> ResourceMetrics:
     """
     Get metrics for a specific resource.
     """
-    db = get_session()
-    resource = db.query(Resource).filter(Resource.resource_id == resource_id).first()
-    if not resource:
-        logger.warning(f"Resource not found for metrics: {resource_id}")
-        return ResourceMetrics(resource_id=resource_id, metrics=[])
+    resource = provider_cache_get(resource_id)
+    if resource is None:
+        with get_sessionmaker()() as db:
+            resource = db.execute(resource_ref_stmt().where(Resource.resource_id == resource_id)).first()
+        if not resource:
+            logger.warning("Resource not found for metrics: %s", resource_id)
+            return ResourceMetrics(resource_id=resource_id, metrics=[])
+        provider_cache_put(resource)
     metrics = fetch_metrics_for_resource(resource)
-    return ResourceMetrics(resource_id=resource_id, metrics=metrics)
+    return to_resource_metrics(resource_id, metrics)
+
+def _fetch_metrics_partition(resources: List[Resource]) -> Dict[str, List[RawMetric]]:
+    """
+    Fetch metrics for one partition of resources: serve cache hits, batch
+    the rest per provider, and populate the cache with the results.
+    Runs on the fetch executor, so it must not submit work back to it.
+    """
+    metrics_by_id: Dict[str, List[RawMetric]] = {}
+    by_provider: Dict[str, List[Resource]] = {}
+    for resource in resources:
+        cached = metrics_cache_get(resource)
+        if cached is not None:
+            metrics_by_id[resource.resource_id] = cached
+        else:
+            by_provider.setdefault(resource.cloud_provider.lower(), []).append(resource)
+    aws_resources = by_provider.pop("aws", [])
+    prometheus_resources = by_provider.pop("prometheus", [])
+    fetched = fetch_aws_cloudwatch_metrics_bulk(aws_resources) if aws_resources else {}
+    if prometheus_resources:
+        fetched.update(fetch_prometheus_metrics_bulk(prometheus_resources))
+    for resource in aws_resources + prometheus_resources:
+        metrics_cache_put(resource, fetched.get(resource.resource_id, []))
+    metrics_by_id.update(fetched)
+    for group in by_provider.values():
+        for resource in group:
+            metrics_by_id[resource.resource_id] = fetch_metrics_for_resource(resource)
+    return metrics_by_id
 
 def get_all_resources_metrics() -> List[ResourceMetrics]:
     """
     Get metrics for all monitored resources.
     """
-    db = get_session()
-    resources = db.query(Resource).filter(Resource.monitoring_enabled == True).all()
-    results = []
-    for resource in resources:
-        metrics = fetch_metrics_for_resource(resource)
-        results.append(ResourceMetrics(resource_id=resource.resource_id, metrics=metrics))
-    logger.info(f"Fetched metrics for {len(results)} resources.")
+    resource_ids: List[str] = []
+    futures = []
+    stmt = resource_ref_stmt().where(Resource.monitoring_enabled == True).execution_options(
+        yield_per=RESOURCE_PARTITION_SIZE
+    )
+    with get_sessionmaker()() as db:
+        # Stream with a server-side cursor, handing each partition to the
+        # executor as it arrives rather than loading the whole fleet first
+        for partition in db.execute(stmt).partitions():
+            resource_ids.extend(r.resource_id for r in partition)
+            futures.append(_fetch_executor.submit(_fetch_metrics_partition, partition))
+    metrics_by_id: Dict[str, List[RawMetric]] = {}
+    for future in futures:
+        metrics_by_id.update(future.result())
+    results = [
+        to_resource_metrics(resource_id, metrics_by_id.get(resource_id, []))
+        for resource_id in resource_ids
+    ]
+    logger.info("Fetched metrics for %s resources.", len(results))
     return results
 
+def get_metrics_signature() -> tuple:
+    """
+    Return a tuple that changes whenever the set of monitored resources
+    changes or a new metrics period begins, for use as an HTTP validator.
+    """
+    with get_sessionmaker()() as db:
+        count, last_updated = db.execute(
+            select(func.count(Resource.id), func.max(Resource.updated_at)).where(
+                Resource.monitoring_enabled == True
+            )
+        ).one()
+    return count, last_updated, int(time.time() // METRICS_PERIOD_SECONDS)
+
 # --- Exports ---
 __all__ = [
+    "fetch_aws_cloudwatch_metrics_bulk",
+    "fetch_prometheus_metrics_bulk",
     "get_resource_metrics",
     "get_all_resources_metrics",
-]
\ No newline at end of file
+    "get_metrics_signature",
+    "refresh_provider_cache",
+]
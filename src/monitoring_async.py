@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .cache import metrics_cache_get, metrics_cache_put, provider_cache_get, provider_cache_put
+from .config import settings
+from .models import Resource, get_async_session
+from .schemas import ResourceMetrics
+from .metrics_common import (
+    CLOUDWATCH_MAX_QUERIES,
+    METRICS_PERIOD_SECONDS,
+    PROMETHEUS_MAX_INSTANCES_PER_QUERY,
+    RESOURCE_PARTITION_SIZE,
+    MetricsBatch,
+    bucket_cloudwatch_page,
+    bucket_prometheus_series,
+    cloudwatch_queries,
+    prometheus_bulk_query,
+    resource_ref_stmt,
+    to_resource_metrics,
+)
+
+# Async counterparts of the boto3/prometheus_api_client integrations in
+# monitoring.py, so metrics endpoints multiplex backend calls on the event
+# loop instead of holding one thread per in-flight request.
+try:
+    from aiobotocore.session import get_session as get_aio_session
+    from aiobotocore.config import AioConfig
+    from botocore.exceptions import BotoCoreError, ClientError
+except ImportError:
+    get_aio_session = None
+
+logger = logging.getLogger("monitoring_async")
+
+# --- Shared Async Clients ---
+
+_clients = AsyncExitStack()
+_cloudwatch = None
+_prom: Optional[httpx.AsyncClient] = None
+_clients_lock = asyncio.Lock()
+_backend_slots = asyncio.Semaphore(settings.MONITORING_CONCURRENCY)
+
+async def _get_cloudwatch():
+    """
+    Return the shared aiobotocore CloudWatch client, held open for the
+    process lifetime and closed by close_async_clients().
+    """
+    global _cloudwatch
+    if _cloudwatch is None:
+        async with _clients_lock:
+            if _cloudwatch is None:
+                _cloudwatch = await _clients.enter_async_context(
+                    get_aio_session().create_client(
+                        "cloudwatch",
+                        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                        region_name=settings.AWS_REGION,
+                        config=AioConfig(
+                            max_pool_connections=max(settings.MONITORING_CONCURRENCY, 10),
+                            retries={"mode": "adaptive", "max_attempts": 5},
+                        ),
+                    )
+                )
+    return _cloudwatch
+
+def _get_prometheus() -> httpx.AsyncClient:
+    """
+    Return the shared Prometheus HTTP client.
+    """
+    global _prom
+    if _prom is None:
+        _prom = httpx.AsyncClient(
+            base_url=str(settings.PROMETHEUS_URL).rstrip("/"),
+            timeout=30.0,
+            verify=False,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        )
+    return _prom
+
+async def close_async_clients() -> None:
+    """
+    Close the shared CloudWatch and Prometheus clients, if they were created.
+    """
+    global _cloudwatch, _prom
+    await _clients.aclose()
+    _cloudwatch = None
+    if _prom is not None:
+        await _prom.aclose()
+        _prom = None
+
+# --- Cloud-Native Monitoring Integration ---
+
+async def _fetch_cloudwatch_chunk(chunk: list, start_time: datetime, end_time: datetime) -> MetricsBatch:
+    batch = MetricsBatch()
+    try:
+        cloudwatch = await _get_cloudwatch()
+        paginator = cloudwatch.get_paginator("get_metric_data")
+        async with _backend_slots:
+            async for page in paginator.paginate(
+                MetricDataQueries=cloudwatch_queries(chunk), StartTime=start_time, EndTime=end_time
+            ):
+                bucket_cloudwatch_page(chunk, page, batch.metrics)
+    except (BotoCoreError, ClientError) as e:
+        logger.error("Error fetching CloudWatch metrics for %s resources: %s", len(chunk), e)
+        batch.failed = True
+    return batch
+
+async def fetch_aws_cloudwatch_metrics_bulk_async(resources: list) -> MetricsBatch:
+    """
+    Async variant of monitoring.fetch_aws_cloudwatch_metrics_bulk();
+    GetMetricData chunks are requested concurrently.
+    """
+    if not get_aio_session:
+        logger.error("aiobotocore is not installed. Async AWS CloudWatch integration unavailable.")
+        return MetricsBatch(failed=True)
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(minutes=60)
+    chunks = await asyncio.gather(*(
+        _fetch_cloudwatch_chunk(resources[offset:offset + CLOUDWATCH_MAX_QUERIES], start_time, end_time)
+        for offset in range(0, len(resources), CLOUDWATCH_MAX_QUERIES)
+    ))
+    results = MetricsBatch()
+    for chunk in chunks:
+        results.merge(chunk)
+    logger.info("Fetched CloudWatch metrics for %s resources.", len(resources))
+    return results
+
+async def _fetch_prometheus_chunk(chunk: list, start_time: datetime, end_time: datetime) -> MetricsBatch:
+    params = {
+        "query": prometheus_bulk_query(chunk),
+        "start": start_time.timestamp(),
+        "end": end_time.timestamp(),
+        "step": METRICS_PERIOD_SECONDS,
+    }
+    try:
+        async with _backend_slots:
+            response = await _get_prometheus().get("/api/v1/query_range", params=params)
+        response.raise_for_status()
+        series_list = response.json()["data"]["result"]
+    except (httpx.HTTPError, KeyError, ValueError) as e:
+        logger.error("Error fetching Prometheus metrics for %s resources: %s", len(chunk), e)
+        return MetricsBatch(failed=True)
+    return MetricsBatch(bucket_prometheus_series(series_list))
+
+async def fetch_prometheus_metrics_bulk_async(resources: list) -> MetricsBatch:
+    """
+    Async variant of monitoring.fetch_prometheus_metrics_bulk();
+    range queries are issued concurrently.
+    """
+    if not settings.PROMETHEUS_URL:
+        logger.error("PROMETHEUS_URL is not configured. Prometheus integration unavailable.")
+        return MetricsBatch(failed=True)
+    # utcnow() is naive; pin UTC so .timestamp() is not read as local time
+    end_time = datetime.utcnow().replace(tzinfo=timezone.utc)
+    start_time = end_time - timedelta(minutes=60)
+    chunks = await asyncio.gather(*(
+        _fetch_prometheus_chunk(resources[offset:offset + PROMETHEUS_MAX_INSTANCES_PER_QUERY], start_time, end_time)
+        for offset in range(0, len(resources), PROMETHEUS_MAX_INSTANCES_PER_QUERY)
+    ))
+    results = MetricsBatch()
+    for chunk in chunks:
+        results.merge(chunk)
+    logger.info("Fetched Prometheus metrics for %s resources.", len(resources))
+    return results
+
+_BULK_FETCHERS = {
+    "aws": fetch_aws_cloudwatch_metrics_bulk_async,
+    "prometheus": fetch_prometheus_metrics_bulk_async,
+}
+
+async def _fetch_metrics_by_provider(resources: list) -> MetricsBatch:
+    """
+    Fetch metrics for resources that missed the cache, one concurrent
+    batch per provider, and populate the cache with the results.
+    """
+    by_provider: Dict[str, list] = {}
+    for resource in resources:
+        by_provider.setdefault(resource.cloud_provider.lower(), []).append(resource)
+    for provider in set(by_provider) - set(_BULK_FETCHERS):
+        # Add more cloud providers as needed (Azure, GCP, etc.)
+        logger.warning("No monitoring integration for provider: %s", provider)
+    providers = [p for p in by_provider if p in _BULK_FETCHERS]
+    batches = await asyncio.gather(*(_BULK_FETCHERS[p](by_provider[p]) for p in providers))
+    results = MetricsBatch()
+    for provider, batch in zip(providers, batches):
+        for resource in by_provider[provider]:
+            metrics_cache_put(resource, batch.metrics.get(resource.resource_id, []))
+        results.merge(batch)
+    return results
+
+# --- Metrics Queries ---
+
+async def get_resource_metrics_async(
+    resource_id: str, session_factory: Optional[async_sessionmaker] = None
+) -> ResourceMetrics:
+    """
+    Get metrics for a specific resource. The resource is looked up with
+    `session_factory` (the shared async sessionmaker by default).
+    """
+    resource = provider_cache_get(resource_id)
+    if resource is None:
+        async with (session_factory or get_async_session())() as db:
+            resource = (await db.execute(resource_ref_stmt().where(Resource.resource_id == resource_id))).first()
+        if not resource:
+            logger.warning("Resource not found for metrics: %s", resource_id)
+            return ResourceMetrics(resource_id=resource_id, metrics=[])
+        provider_cache_put(resource)
+    metrics = metrics_cache_get(resource)
+    if metrics is None:
+        metrics = (await _fetch_metrics_by_provider([resource])).metrics.get(resource_id, [])
+    return to_resource_metrics(resource_id, metrics)
+
+async def _fetch_metrics_partition_async(resources: list) -> MetricsBatch:
+    batch = MetricsBatch()
+    pending = []
+    for resource in resources:
+        cached = metrics_cache_get(resource)
+        if cached is not None:
+            batch.metrics[resource.resource_id] = cached
+        else:
+            pending.append(resource)
+    if pending:
+        batch.merge(await _fetch_metrics_by_provider(pending))
+    return batch
+
+async def get_all_resources_metrics_async(
+    session_factory: Optional[async_sessionmaker] = None,
+) -> Tuple[List[ResourceMetrics], bool]:
+    """
+    Get metrics for all monitored resources, streaming them from the
+    database in partitions that are fetched concurrently.
+    Returns the metrics and whether any backend request failed.
+    """
+    resource_ids: List[str] = []
+    tasks = []
+    stmt = resource_ref_stmt().where(Resource.monitoring_enabled == True).execution_options(
+        yield_per=RESOURCE_PARTITION_SIZE
+    )
+    async with (session_factory or get_async_session())() as db:
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            resource_ids.extend(r.resource_id for r in partition)
+            tasks.append(asyncio.create_task(_fetch_metrics_partition_async(partition)))
+    fetched = MetricsBatch()
+    for partition_batch in await asyncio.gather(*tasks):
+        fetched.merge(partition_batch)
+    results = [
+        to_resource_metrics(resource_id, fetched.metrics.get(resource_id, []))
+        for resource_id in resource_ids
+    ]
+    logger.info("Fetched metrics for %s resources.", len(results))
+    return results, fetched.failed
+
+async def get_metrics_signature_async(db: AsyncSession) -> tuple:
+    """
+    Return a tuple that changes whenever the set of monitored resources
+    changes or a new metrics period begins, for use as an HTTP validator.
+    """
+    count, last_updated = (await db.execute(
+        select(func.count(Resource.id), func.max(Resource.updated_at)).where(
+            Resource.monitoring_enabled == True
+        )
+    )).one()
+    return count, last_updated, int(time.time() // METRICS_PERIOD_SECONDS)
+
+# --- Exports ---
+__all__ = [
+    "fetch_aws_cloudwatch_metrics_bulk_async",
+    "fetch_prometheus_metrics_bulk_async",
+    "get_resource_metrics_async",
+    "get_all_resources_metrics_async",
+    "get_metrics_signature_async",
+    "close_async_clients",
+]
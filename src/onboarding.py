@@ -1,12 +1,19 @@
+import asyncio
 import logging
 from typing import List, Dict, Any
 from datetime import datetime
 
+from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from .models import Resource, ResourceType, get_session
-from .crud import create_resource, get_resource_by_resource_id
+from .models import Resource, ResourceType, get_sessionmaker
+from .schemas import ResourceCreate
+from .crud import (
+    create_resource,
+    create_resources_if_absent,
+    get_resource_by_resource_id,
+)
 from .config import settings
 
 logger = logging.getLogger("onboarding")
@@ -64,6 +71,20 @@ def discover_all_resources() -> List[Dict[str, Any]]:
     # Add more providers as needed
     return resources
 
+async def discover_all_resources_async() -> List[Dict[str, Any]]:
+    """
+    Run discovery for all enabled providers concurrently, so total latency
+    is that of the slowest provider rather than the sum of them all.
+    """
+    discoverers = []
+    if settings.ENABLE_AWS_DISCOVERY:
+        discoverers.append(discover_aws_resources)
+    if settings.ENABLE_PROMETHEUS_DISCOVERY:
+        discoverers.append(discover_prometheus_resources)
+    # Discoverers make blocking SDK/HTTP calls, so each gets its own thread
+    results = await asyncio.gather(*(asyncio.to_thread(discover) for discover in discoverers))
+    return [resource for provider_resources in results for resource in provider_resources]
+
 # --- Onboarding Logic ---
 
 def onboard_resource(db: Session, resource_data: Dict[str, Any]) -> bool:
@@ -73,15 +94,15 @@ def onboard_resource(db: Session, resource_data: Dict[str, Any]) -> bool:
     """
     existing = get_resource_by_resource_id(db, resource_data["resource_id"])
     if existing:
-        logger.info(f"Resource already onboarded: {resource_data['resource_id']}")
+        logger.info("Resource already onboarded: %s", resource_data['resource_id'])
         return False
     try:
-        create_resource(db, resource_data)
-        logger.info(f"Resource onboarded: {resource_data['resource_id']}")
+        create_resource(db, ResourceCreate(**resource_data))
+        logger.info("Resource onboarded: %s", resource_data['resource_id'])
         return True
-    except SQLAlchemyError as e:
+    except (HTTPException, SQLAlchemyError) as e:
         db.rollback()
-        logger.error(f"Error onboarding resource {resource_data['resource_id']}: {e}")
+        logger.error("Error onboarding resource %s: %s", resource_data['resource_id'], e)
         return False
 
 def trigger_resource_onboarding():
@@ -89,14 +110,23 @@ def trigger_resource_onboarding():
     Discover and onboard new cloud resources.
     This function is intended to be run as a background task.
     """
-    db = get_session()
-    discovered = discover_all_resources()
-    onboarded_count = 0
-    for resource_data in discovered:
-        if onboard_resource(db, resource_data):
-            onboarded_count += 1
-    logger.info(f"Onboarding complete. {onboarded_count} new resources onboarded.")
-    db.close()
+    # Runs as a background task in a worker thread, which has no event loop of its own
+    discovered = asyncio.run(discover_all_resources_async())
+    # A resource seen by several providers is onboarded once; earlier providers win
+    deduped = list({r["resource_id"]: r for r in discovered}.values())
+    if len(deduped) < len(discovered):
+        logger.info("Dropped %s duplicate discovered resources.", len(discovered) - len(deduped))
+    discovered = deduped
+    with get_sessionmaker()() as db:
+        try:
+            onboarded_count = len(
+                create_resources_if_absent(db, [ResourceCreate(**r) for r in discovered])
+            )
+        except HTTPException:
+            # Isolate whichever resource made the batch fail
+            logger.warning("Bulk onboarding failed, falling back to per-resource onboarding.")
+            onboarded_count = sum(onboard_resource(db, r) for r in discovered)
+    logger.info("Onboarding complete. %s new resources onboarded.", onboarded_count)
 
 # --- Exports ---
 __all__ = [
@@ -1,13 +1,18 @@
 from datetime import datetime
-from typing import Optional, List, Any
-from pydantic import BaseModel, Field, constr
+from typing import Annotated, Optional, List, Any
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 
 from .models import AlertStatus, AlertSeverity, ResourceType
 
+# --- Constrained Types ---
+
+Name128 = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=128)]
+Name64 = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=64)]
+
 # --- Product Schemas ---
 
 class ProductBase(BaseModel):
-    name: constr(strip_whitespace=True, min_length=1, max_length=128)
+    name: Name128
     description: Optional[str] = None
 
 class ProductCreate(ProductBase):
@@ -20,7 +25,7 @@ class ProductUpdate(BaseModel):
     """
     Schema for updating an existing product.
     """
-    name: Optional[constr(strip_whitespace=True, min_length=1, max_length=128)] = None
+    name: Optional[Name128] = None
     description: Optional[str] = None
 
 class ProductOut(ProductBase):
@@ -31,16 +36,15 @@ class ProductOut(ProductBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # --- Resource Schemas ---
 
 class ResourceBase(BaseModel):
-    resource_id: constr(strip_whitespace=True, min_length=1, max_length=128)
-    name: constr(strip_whitespace=True, min_length=1, max_length=128)
+    resource_id: Name128
+    name: Name128
     type: ResourceType
-    cloud_provider: constr(strip_whitespace=True, min_length=1, max_length=64)
+    cloud_provider: Name64
     onboarded: Optional[bool] = True
     monitoring_enabled: Optional[bool] = True
 
@@ -54,9 +58,9 @@ class ResourceUpdate(BaseModel):
     """
     Schema for updating an existing resource.
     """
-    name: Optional[constr(strip_whitespace=True, min_length=1, max_length=128)] = None
+    name: Optional[Name128] = None
     type: Optional[ResourceType] = None
-    cloud_provider: Optional[constr(strip_whitespace=True, min_length=1, max_length=64)] = None
+    cloud_provider: Optional[Name64] = None
     onboarded: Optional[bool] = None
     monitoring_enabled: Optional[bool] = None
 
@@ -68,8 +72,7 @@ class ResourceOut(ResourceBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # --- Alert Schemas ---
 
@@ -94,6 +97,12 @@ class AlertUpdate(BaseModel):
     status: Optional[AlertStatus] = None
     resolved_at: Optional[datetime] = None
 
+class AlertResolveMany(BaseModel):
+    """
+    Schema for resolving several alerts in one request.
+    """
+    alert_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
 class AlertOut(AlertBase):
     """
     Schema for returning alert data.
@@ -102,8 +111,7 @@ class AlertOut(AlertBase):
     triggered_at: datetime
     resolved_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # --- Audit Log Schemas ---
 
@@ -126,8 +134,7 @@ class AuditLogOut(AuditLogBase):
     id: int
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # --- Metrics Schemas ---
 
@@ -150,6 +157,8 @@ class ResourceMetrics(BaseModel):
 
 # --- Exports ---
 __all__ = [
+    "Name128",
+    "Name64",
     "ProductBase",
     "ProductCreate",
     "ProductUpdate",
@@ -161,6 +170,7 @@ __all__ = [
     "AlertBase",
     "AlertCreate",
     "AlertUpdate",
+    "AlertResolveMany",
     "AlertOut",
     "AuditLogBase",
     "AuditLogCreate",
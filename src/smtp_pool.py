@@ -0,0 +1,113 @@
+import atexit
+import logging
+import queue
+import smtplib
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from .config import settings
+
+logger = logging.getLogger("smtp_pool")
+
+# --- Pooled SMTP Connection ---
+
+class SMTPConnection:
+    """
+    Long-lived SMTP connection that is opened lazily, health-checked with
+    NOOP before reuse and transparently re-established when dropped.
+    """
+
+    def __init__(self) -> None:
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
+        if settings.SMTP_USE_TLS:
+            server.starttls()
+        if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
+            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        logger.info("SMTP connection opened to %s:%s", settings.SMTP_SERVER, settings.SMTP_PORT)
+        return server
+
+    def _ensure_connected(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+        self._smtp = self._connect()
+        return self._smtp
+
+    def sendmail(self, from_addr: str, to_addrs: List[str], msg: str) -> None:
+        """
+        Send a message, reconnecting once if the server dropped the connection.
+        """
+        server = self._ensure_connected()
+        try:
+            server.sendmail(from_addr, to_addrs, msg)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._ensure_connected().sendmail(from_addr, to_addrs, msg)
+
+    def close(self) -> None:
+        """
+        Gracefully close the underlying connection, if open.
+        """
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        finally:
+            self._smtp = None
+
+# --- Pool Management ---
+
+_pool: Optional["queue.LifoQueue[SMTPConnection]"] = None
+_connections: List[SMTPConnection] = []
+_pool_lock = threading.Lock()
+
+def _get_pool() -> "queue.LifoQueue[SMTPConnection]":
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool: "queue.LifoQueue[SMTPConnection]" = queue.LifoQueue(maxsize=settings.SMTP_POOL_SIZE)
+                for _ in range(settings.SMTP_POOL_SIZE):
+                    conn = SMTPConnection()
+                    _connections.append(conn)
+                    pool.put(conn)
+                _pool = pool
+    return _pool
+
+@contextmanager
+def smtp_connection() -> Iterator[SMTPConnection]:
+    """
+    Borrow a pooled SMTP connection, returning it to the pool afterwards.
+    """
+    pool = _get_pool()
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
+
+def close_all() -> None:
+    """
+    Quit every pooled SMTP connection. Registered to run at interpreter exit.
+    """
+    for conn in _connections:
+        conn.close()
+
+atexit.register(close_all)
+
+# --- Exports ---
+__all__ = [
+    "SMTPConnection",
+    "smtp_connection",
+    "close_all",
+]